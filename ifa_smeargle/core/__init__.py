@@ -9,6 +9,7 @@ a pipeline script directly.
 from ifa_smeargle.core import configuration as config
 from ifa_smeargle.core import error as error
 from ifa_smeargle.core import io as io
+from ifa_smeargle.core import jit
 from ifa_smeargle.core import magic
 from ifa_smeargle.core import mathematics as math
 from ifa_smeargle.core import modeling as model
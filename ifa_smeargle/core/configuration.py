@@ -4,10 +4,12 @@ writing, and validating of configuration files.
 """
 
 import copy
+import functools
 import configobj
 import validate
 import os
 import shutil
+import stat
 import ifa_smeargle.core as core
 
 
@@ -28,43 +30,64 @@ def extract_configuration(config_object, keys):
         The value that the keys was containing.
     """
 
-    # Copy objects, this is to ensure nothing is messed up.
-    config_copy = dict(copy.deepcopy(config_object))
-    keys_copy = copy.deepcopy(keys)
-    
     # The keys must be a list, if only a single tag it is likely 
     # that the next result would be the answer.
+    if (isinstance(keys, str)):
+        keys_tuple = (keys,)
+    elif (isinstance(keys, (list, tuple)) and (len(keys) != 0)):
+        keys_tuple = tuple(keys)
+    else:
+        raise core.error.InputError("The keys were not in a manageable "
+                                    "form specified by this function.")
+
+    # Dig through the sub-layers of the configuration, one key at a 
+    # time. Only the value itself is copied; copying the entire 
+    # configuration object is not needed to ensure that nothing is 
+    # messed up.
     try:
-        if ((isinstance(keys_copy,str)) or 
-            ((len(keys_copy) == 1) and (isinstance(keys_copy,(list,tuple))))):
-            # Return the value.
-            keys_copy = ([keys_copy] if isinstance(keys_copy, str) 
-                         else keys_copy)
-            return config_copy[str(keys_copy[0])]
-        elif (isinstance(keys_copy, (list, tuple))):
-            # There likely is more sub-layers to this configuration 
-            # file. Dig another layer deeper.
-            new_config_object = config_object[keys_copy[0]]
-            new_keys = tuple(keys[1:])
-
-            return extract_configuration(config_object=new_config_object, 
-                                         keys=new_keys)
-        else:
-            raise core.error.InputError("The keys were not in a manageable "
-                                        "form specified by this function.")
-    except (KeyError, AttributeError):
+        value = config_object
+        for keydex in keys_tuple:
+            value = value[str(keydex)]
+    except (KeyError, AttributeError, TypeError):
         # The extra quote mark printed is a property of Python, see
         # https://stackoverflow.com/a/24999035
         raise KeyError("In the configuration file `{config_file}`, "
                        "there does not exist the configuration key "
                        "path:  {key_path}"
-                       .format(config_file=config_object.filename, 
-                               key_path='->'.join(keys)))
+                       .format(config_file=getattr(config_object, 
+                                                   'filename', None), 
+                               key_path='->'.join(
+                                   [str(keydex) for keydex in keys_tuple])))
+    return copy.deepcopy(value)
 
-    # The program should not get to here.
-    raise core.error.BrokenLogicError
-    return None
+def flatten_configuration(config_object):
+    """ This flattens a configuration object into a single level 
+    dictionary. The keys of the dictionary are the tuples of the 
+    keys that would be given to `extract_configuration`; this allows
+    for many configuration parameters to be obtained quickly.
 
+    Parameters
+    ----------
+    config_object : ConfigObj
+        The configuration object that is going to be flattened.
+
+    Returns
+    -------
+    flat_config : dictionary
+        The flattened configuration, the values are copies. For 
+        example, the value of `['geometric','run_mask_rows']` is 
+        keyed as `('geometric','run_mask_rows')`.
+    """
+    flat_config = {}
+    for keydex, valuedex in config_object.items():
+        if (isinstance(valuedex, dict)):
+            # This is a section, dig another layer deeper.
+            for subkeydex, subvaluedex in flatten_configuration(
+                config_object=valuedex).items():
+                flat_config[(keydex,) + subkeydex] = subvaluedex
+        else:
+            flat_config[(keydex,)] = copy.deepcopy(valuedex)
+    return flat_config
 
 
 def read_configuration_file(config_file_name, specification_file_name):
@@ -229,20 +252,16 @@ def copy_configuration_file(config_type, destination, file_name=None):
 
     # Obtaining the list of configuration files.
     config_files = core.runtime.get_configuration_files()
-    # This is mostly for error messages and warnings as it is a 
-    # nice string of the available configurations.
-    avaliable_config_types = ', '.join(
-        [keydex for keydex, __ in config_files.items()])
 
-    # Checking for valid configuration files.
+    # Checking for valid configuration files. The substrings of the 
+    # configuration types are indexed so that they can be matched 
+    # with a single lookup.
     matching_files = {}
-    for keydex, pathdex in copy.deepcopy(config_files).items():
-        if (config_type in keydex):
-            # The configuration file matches 
-            matching_files[keydex] = pathdex
-        else:
-            # It is not a matching file.
-            continue
+    substring_index = _get_configuration_substring_index(
+        config_keys=tuple(config_files.keys()))
+    for keydex in substring_index.get(config_type, ()):
+        # The configuration file matches 
+        matching_files[keydex] = config_files[keydex]
 
     # There should only be one matching file. If there is an improper
     # number, then inform the user.
@@ -253,51 +272,7 @@ def copy_configuration_file(config_type, destination, file_name=None):
                                     "The available configurations are: "
                                     "\n    {available}"
                                     .format(type=config_type, 
-                                            available=avaliable_config_types))
-    elif (len(matching_files) == 1):
-        # All is normal, the configuration file should be copied 
-        # into the new directory, the file name is added too.
-        # Check on if the directory provided is a valid one.
-        if (os.path.isdir(destination)):
-            dir = destination
-        elif (os.path.isfile(destination)):
-            # Attempt to extract only the needed directory 
-            # information.
-            dir, __, __ = core.strformat.split_pathname(pathname=destination)
-        else:
-            raise core.error.InputError("The destination provided is not a "
-                                        "valid directory. Destination: "
-                                        "`{dest}`"
-                                        .format(dest=destination))
-        # The source path for the copied directory file. This should
-        # be okay as there is only one entry in the dictionary.
-        source_path = list(matching_files.values())[0]
-        # Constructing the destination path name for the copied file.
-        if (file_name is not None):
-            # A file name was provided, use it.
-            __, file_name, __ = core.strformat.split_pathname(
-                pathname=file_name)
-            config_path = core.strformat.combine_pathname(
-                directory=dir, file_name=file_name, extension='.ini')
-        else:
-            # A file name has not been provided, default to the 
-            # copied file name.
-            __, file_name, __ = core.strformat.split_pathname(
-                pathname=source_path)
-            config_path = core.strformat.combine_pathname(
-                directory=dir, file_name=file_name, extension='.ini')
-
-        # Inform that the file is being copied.
-        core.error.ifas_info("The configuration file matching `{type}` is "
-                             "being copied. \n "
-                             "Source: {src}   Destination: {dest}"
-                             .format(type=config_type, src=source_path, 
-                                     dest=config_path))
-        # Copying the file.
-        shutil.copyfile(source_path, config_path, follow_symlinks=True)
-
-        # Returning the path in the event that they need it. 
-        return config_path
+                                            available=', '.join(config_files)))
     elif (len(matching_files) >= 2):
         # It is indeterminable as to which file should be coped.
         raise core.error.InputError("The configuration type `{type}` "
@@ -308,15 +283,81 @@ def copy_configuration_file(config_type, destination, file_name=None):
                                     "\n Matching:  {match} "
                                     "\n Available:  {available}"
                                     .format(type=config_type,
-                                            match=', '.join(
-                                                [keydex for keydex, __ 
-                                                 in matching_files.items()]),
-                                            available=avaliable_config_types))
+                                            match=', '.join(matching_files),
+                                            available=', '.join(config_files)))
+
+    # All is normal, the configuration file should be copied into the 
+    # new directory, the file name is added too.
+    # Check on if the directory provided is a valid one. A single 
+    # stat determines if it is a directory or a file.
+    try:
+        destination_mode = os.stat(destination).st_mode
+    except (OSError, ValueError):
+        destination_mode = 0
+    if (stat.S_ISDIR(destination_mode)):
+        dir = destination
+    elif (stat.S_ISREG(destination_mode)):
+        # Attempt to extract only the needed directory information.
+        dir, __, __ = core.strformat.split_pathname(pathname=destination)
     else:
-        # There is no reason why the code should enter here as the 
-        # lengths should be defined.
-        raise core.error.BrokenLogicError
+        raise core.error.InputError("The destination provided is not a "
+                                    "valid directory. Destination: "
+                                    "`{dest}`"
+                                    .format(dest=destination))
+    # The source path for the copied directory file. This should be 
+    # okay as there is only one entry in the dictionary.
+    source_path = list(matching_files.values())[0]
+    # Constructing the destination path name for the copied file.
+    if (file_name is not None):
+        # A file name was provided, use it.
+        __, file_name, __ = core.strformat.split_pathname(
+            pathname=file_name)
+    else:
+        # A file name has not been provided, default to the copied 
+        # file name.
+        __, file_name, __ = core.strformat.split_pathname(
+            pathname=source_path)
+    config_path = core.strformat.combine_pathname(
+        directory=dir, file_name=file_name, extension='.ini')
 
-    # All done. Though, it should still not enter here either.
-    raise core.error.BrokenLogicError
-    return None
\ No newline at end of file
+    # Inform that the file is being copied.
+    core.error.ifas_info("The configuration file matching `{type}` is "
+                         "being copied. \n "
+                         "Source: {src}   Destination: {dest}"
+                         .format(type=config_type, src=source_path, 
+                                 dest=config_path))
+    # Copying the file. Shutil already uses the zero-copy functions of 
+    # the operating system where available.
+    shutil.copyfile(source_path, config_path, follow_symlinks=True)
+
+    # Returning the path in the event that they need it. 
+    return config_path
+
+@functools.lru_cache(maxsize=1)
+def _get_configuration_substring_index(config_keys):
+    """ This creates an index of every substring of the configuration 
+    types, for the substring testing of `copy_configuration_file`.
+
+    Parameters
+    ----------
+    config_keys : tuple
+        The configuration types, the keys of the configuration 
+        files dictionary.
+
+    Returns
+    -------
+    substring_index : dictionary
+        The configuration types, as tuples, which contain each 
+        substring; keyed by the substring.
+    """
+    substring_index = {}
+    for keydex in config_keys:
+        # All unique substrings of this configuration type, the 
+        # empty string is a substring of everything.
+        substrings = set(keydex[startdex:enddex] 
+                         for startdex in range(len(keydex) + 1) 
+                         for enddex in range(startdex, len(keydex) + 1))
+        for substringdex in substrings:
+            substring_index[substringdex] = (
+                substring_index.get(substringdex, ()) + (keydex,))
+    return substring_index
@@ -12,5 +12,9 @@ COLLPASED_SUBDIR = string(default='SMEARGLE_COLLPASE')
 MASKING_SUBDIR = string(default='SMEARGLE_MASKS')
 FILTERING_SUBDIR = string(default='SMEARGLE_FILTERS')
 
+PARALLEL_WORKERS = integer(min=0, default=0)
+
+BITGEN = option('SFC64', 'PCG64', default='SFC64')
+
 [meta]
     config_spec = string
\ No newline at end of file
@@ -7,10 +7,11 @@ import astropy.io.fits as ap_fits
 import numpy as np
 import numpy.ma as np_ma
 import copy
+import functools
 import time
-import glob
 import shutil
 import os
+import stat
 
 import ifa_smeargle.core as core
 
@@ -284,8 +285,8 @@ def rename_by_parallel_append(file_names, appending_names, directory=None):
     return None
 
 def get_fits_filenames(data_directory, sub_extension=None, recursive=False):
-    """ This function is a wrapper function around the glob command 
-    to get all fits files.
+    """ This function obtains all of the fits files within a 
+    directory, akin to the glob command.
 
     Parameters
     ----------
@@ -334,13 +335,22 @@ def get_fits_filenames(data_directory, sub_extension=None, recursive=False):
         # Just stick to the default extension.
         extension = '.fits'
 
+    # A single stat of the path determines if it is a directory or a 
+    # file; a path that does not exist is neither.
+    try:
+        path_mode = os.stat(data_directory).st_mode
+    except (OSError, ValueError):
+        path_mode = 0
+    is_directory = stat.S_ISDIR(path_mode)
+    is_file = stat.S_ISREG(path_mode)
+
     # Allow a single fits file if the file is a valid fits file. 
     # This is to allow single file scripts rather than whole 
     # directory scripts.
-    if ((not os.path.isdir(data_directory)) and (not recursive)):
+    if ((not is_directory) and (not recursive)):
         # It is not a directory, check if it is a fits file instead.
         # Testing for existence and extension.
-        if ((os.path.isfile(data_directory)) and 
+        if ((is_file) and 
              (core.strformat.split_pathname(
                  pathname=data_directory)[-1] == extension)):
             # If Astropy can deal with it, it should be good enough.
@@ -366,10 +376,9 @@ def get_fits_filenames(data_directory, sub_extension=None, recursive=False):
     else:
         # Process the directory like normal and obtain the fits 
         # files.
-        dir_list = [data_directory, '**'] if recursive else [data_directory]
-        fits_filenames = glob.glob(core.strformat.combine_pathname(
-            directory=dir_list, file_name=['*'], extension=[extension]),
-                                   recursive=recursive)
+        fits_filenames = _scan_fits_filenames(directory=data_directory, 
+                                              extension=extension, 
+                                              recursive=recursive)
 
         # Check and warn for no files found.
         if (len(fits_filenames) == 0):
@@ -383,7 +392,52 @@ def get_fits_filenames(data_directory, sub_extension=None, recursive=False):
     raise core.error.BrokenLogicError
     return None
 
-def read_fits_file(file_name, extension=0, silent=False):
+def _scan_fits_filenames(directory, extension, recursive):
+    """ This finds the files in a directory with the provided 
+    extension, like a `*.fits` glob would (hidden files are skipped 
+    and symbolic links are followed). The file type information 
+    given by the directory scan is used so that most entries do not 
+    need a separate stat.
+
+    Parameters
+    ----------
+    directory : string
+        The directory that the files will be searched for from.
+    extension : string
+        The full extension of the files, e.g. `.mask.fits`.
+    recursive : boolean
+        If True, also search all (non-hidden) subdirectories.
+
+    Returns
+    -------
+    file_names : list
+        The list of the file names found.
+    """
+    # Like a glob, a path which is not a (readable) directory has 
+    # no files.
+    try:
+        scan_entries = os.scandir(directory)
+    except OSError:
+        return []
+    file_names = []
+    subdirectories = []
+    with scan_entries:
+        for entrydex in scan_entries:
+            # Hidden files and directories, as glob does.
+            if (entrydex.name.startswith('.')):
+                continue
+            if (entrydex.name.endswith(extension) and entrydex.is_file()):
+                file_names.append(entrydex.path)
+            elif (recursive and entrydex.is_dir()):
+                subdirectories.append(entrydex.path)
+    # Search the subdirectories after the files of this one.
+    for subdirectorydex in subdirectories:
+        file_names.extend(_scan_fits_filenames(directory=subdirectorydex, 
+                                               extension=extension, 
+                                               recursive=recursive))
+    return file_names
+
+def read_fits_file(file_name, extension=0, silent=False, memmap=False):
     """ A function to ensure proper loading/reading of fits files.
 
     This function, as its name, opens a fits file. It returns the 
@@ -402,6 +456,13 @@ def read_fits_file(file_name, extension=0, silent=False):
     silent : boolean (optional)
         Turn off all warnings and information sent by this function 
         and functions below it.
+    memmap : boolean (optional)
+        If True, the data is memory mapped from the file rather than 
+        read into memory; only the parts of it that are used are 
+        read. The frames with nan/null values are not checked for or 
+        nulled as that would require reading all of the data. Scaled 
+        data, with BZERO/BSCALE/BLANK header keywords, cannot be 
+        memory mapped and is read normally.
 
     Returns
     -------
@@ -418,24 +479,41 @@ def read_fits_file(file_name, extension=0, silent=False):
     if (silent):
         with core.error.ifas_absolute_silence():
             return read_fits_file(file_name=file_name, extension=extension,
-                                  silent=False)
-
-    with ap_fits.open(file_name) as hdul:
-        hdul_file = copy.deepcopy(hdul)
-        
-        # Just because just in case.
-        hdul.close()
-        del hdul
-
-    # Read from the extension
-    hdu_header = hdul_file[extension].header
-    hdu_data = hdul_file[extension].data
+                                  silent=False, memmap=memmap)
+
+    if (memmap):
+        with ap_fits.open(file_name, memmap=True) as hdul_file:
+            # Read from the extension. Memory mapped data must be 
+            # accessed while the file is open; these references keep 
+            # it mapped after the file is closed.
+            hdu_header = hdul_file[extension].header
+            # Scaled data (e.g. unsigned integers) cannot be memory 
+            # mapped by Astropy; it is read normally instead.
+            memmap = not any(keydex in hdu_header 
+                             for keydex in ('BZERO', 'BSCALE', 'BLANK'))
+            if (memmap):
+                hdu_data = hdul_file[extension].data
+                ifas_mask = (hdul_file['IFASMASK'].data 
+                             if ('IFASMASK' in hdul_file) else None)
+    if (not memmap):
+        with ap_fits.open(file_name) as hdul:
+            hdul_file = copy.deepcopy(hdul)
+            
+            # Just because just in case.
+            hdul.close()
+            del hdul
+
+        # Read from the extension
+        hdu_header = hdul_file[extension].header
+        hdu_data = hdul_file[extension].data
+        ifas_mask = (hdul_file['IFASMASK'].data 
+                     if ('IFASMASK' in hdul_file) else None)
 
     # For some reason, there are null problems and value problems 
     # with the data. Any and all frames that match the criteria are 
     # nulled out. Send a warning.
-    # Check first for nans.
-    if (np.any(np.isnan(hdu_data))):
+    # Check first for nans. Memory mapped data is not checked.
+    if ((not memmap) and np.any(np.isnan(hdu_data))):
         # Test for bad or nan/null values. Of course, there is not 
         # need for repeat frames.
         nan_index_data = np.argwhere(np.isnan(hdu_data))
@@ -470,40 +548,75 @@ def read_fits_file(file_name, extension=0, silent=False):
     # Check if there is an IfA-Smeargle mask, if so, mutate data 
     # to a masked array. This is depreciated in favor of saving the 
     # mask as a separate fits file.
-    try:
-        data_mask = hdul_file['IFASMASK'].data
+    if (ifas_mask is not None):
         # Because fits files do not handle boolean arrays, convert 
         # from the int 1/0 array in the file.
-        data_mask = np.array(np.where(data_mask >= 1, True, False), 
+        data_mask = np.array(np.where(ifas_mask >= 1, True, False), 
                              dtype=bool)
+        # Inform that a mask has been found and is going to be 
+        # used.
+        core.error.ifas_info("The fits file contains an <IFASMASK> "
+                             "extension, a pixel mask created by "
+                             "this program. It will be applied to "
+                             "the data. The output data will be a "
+                             "Numpy Masked Array.")
+        # Also inform of the depreciated nature of this feature.
+        core.error.ifas_warning(core.error.DepreciationWarning,
+                                ("Storing masks in an <IFASMASK> "
+                                 "extension is unfavored in lieu of "
+                                 "saving the mask as a separate file."))
 
-    except KeyError:
-        data_mask = None
-    finally:
-        if (data_mask is not None):
-            # Inform that a mask has been found and is going to be 
-            # used.
-            core.error.ifas_info("The fits file contains an <IFASMASK> "
-                                 "extension, a pixel mask created by "
-                                 "this program. It will be applied to "
-                                 "the data. The output data will be a "
-                                 "Numpy Masked Array.")
-            # Also inform of the depreciated nature of this feature.
-            core.error.ifas_warning(core.error.DepreciationWarning,
-                                    ("Storing masks in an <IFASMASK> "
-                                     "extension is unfavored in lieu of "
-                                     "saving the mask as a separate file."))
-
-            # Apply the mask.
-            hdu_data = np_ma.array(hdu_data, mask=data_mask)
-        else:
-            hdu_data = np.array(hdu_data)
+        # Apply the mask.
+        hdu_data = np_ma.array(hdu_data, mask=data_mask)
+    elif (memmap):
+        # Copying would read all of the data.
+        hdu_data = np.asarray(hdu_data)
+    else:
+        hdu_data = np.array(hdu_data)
 
     # Finally return. Inform the successful reading.
     core.error.ifas_info("Successfully read {read_fits} into memory."
                    .format(read_fits=file_name))
     return hdul_file, hdu_header, hdu_data
 
+def read_fits_shape(file_name, extension=0):
+    """ A function to read the shape of the data of a fits file from 
+    its header alone, without reading the data itself.
+
+    The shapes are cached by file name, extension, and modification 
+    time; a file is parsed only once no matter how many times its 
+    shape is asked for, unless it has been modified since.
+
+    Parameters
+    ----------
+    file_name : string
+        This is the path of the file to be read, either relative 
+        or absolute.
+    extension : int or string (optional)
+        The desired extension of the fits file. Defaults to primary 
+        structure. 
+
+    Returns
+    -------
+    data_shape : tuple
+        The shape of the data, in the same (Numpy) order as the shape 
+        of the array read by `read_fits_file`.
+    """
+    return _read_fits_shape_cached(
+        file_name=file_name, extension=extension,
+        modified_time=os.stat(file_name).st_mtime_ns)
+
+@functools.lru_cache(maxsize=1024)
+def _read_fits_shape_cached(file_name, extension, modified_time):
+    """ The cached implementation of `read_fits_shape`. The 
+    modification time is only part of the cache key. """
+    hdu_header = ap_fits.getheader(file_name, ext=extension)
+    # The FITS axes are ordered fastest varying first, which is the 
+    # reverse of Numpy.
+    data_shape = tuple(int(hdu_header[''.join(['NAXIS', str(axisdex)])])
+                       for axisdex in range(int(hdu_header['NAXIS']), 0, -1))
+    return data_shape
+
 def write_fits_file(file_name, hdu_header, hdu_data, hdu_object=None, 
                     save_file=True, overwrite=False, silent=False):
     """ A function to ensure proper writing of fits files.
@@ -636,30 +749,28 @@ def write_fits_file(file_name, hdu_header, hdu_data, hdu_object=None,
 
     return hdul_file
 
-def append_astropy_header_card(file_name, header_cards, comment_cards=None):
-    """ This is a function to add header card entries into the 
-    header of a fits file. This uses dictionaries to achieve said 
-    result.
+def update_astropy_header(hdu_header, header_cards, comment_cards=None):
+    """ This is a function to add header card entries into a header
+    in memory. This uses dictionaries to achieve said result. See 
+    `append_astropy_header_card` to add them to a file instead.
 
     Parameters
     ----------
-    file_name : string
-        This is the path of the file to be written, either relative 
-        or absolute.
+    hdu_header : Header
+        The Astropy header object that the entries will be added to.
+        It is changed in place.
     header_cards : dictionary
-        The header entries to be added to the header file. Please 
-        note that the keys of the dictionary must be no more than 
-        8 characters; otherwise a HIERARCH card will be used.
+        The header entries to be added to the header. Please note 
+        that the keys of the dictionary must be no more than 8 
+        characters; otherwise a HIERARCH card will be used.
     comment_cards : dictionary (optional)
-        The comment entries to be added to the header file. The 
-        keys of the comment dictionary and the `header_cards` must 
-        line up.
+        The comment entries to be added to the header. The keys of 
+        the comment dictionary and the `header_cards` must line up.
 
     Returns
     -------
-    hdul_file : Astropy PrimaryHDU
-        The file object that was written to disk. If ``hdu_object`` 
-        was provided, it is returned with its header changed.
+    hdu_header : Header
+        The same header, with the entries added.
     """
     # Sort the comment cards to the needed dictionary. If it is 
     # nothing, then a blank dictionary is compatible with no comment.
@@ -667,55 +778,74 @@ def append_astropy_header_card(file_name, header_cards, comment_cards=None):
                      else dict())
 
     # Add the entries.
-    for keydex, valuedex in copy.deepcopy(header_cards).items():
+    for keydex, valuedex in header_cards.items():
         # Check that the entries are valid type based on the FITS 
         # specification. Astropy does this, but it is not as clear.
         if (isinstance(valuedex, (int, float, str))):
-            # This is a valid and accepted type, write to the Header.
-            ap_fits.setval(file_name, keydex, value=valuedex, 
-                           comment=comment_cards.get(keydex,None))
+            # This is a valid and accepted type, write to the 
+            # Header.
+            converted_value = valuedex
         elif (isinstance(valuedex, bool)):
             core.error.ifas_log_warning(core.error.ExportingWarning,
                                         ("FITS Headers cannot store a "
-                                         "boolean directly but can use T/F "
-                                         "letters. The boolean has been "
-                                         "converted."))
+                                         "boolean directly but can use "
+                                         "T/F letters. The boolean has "
+                                         "been converted."))
             # Convert to a fits proper type.
             converted_value = 'T' if valuedex else 'F'
-            ap_fits.setval(file_name, keydex, value=converted_value, 
-                           comment=comment_cards.get(keydex,None))
         else:
             core.error.ifas_warning(core.error.ExportingWarning,
                                     ("The header card key-value pair "
-                                     "({key} = {value}) uses a value type "
-                                     "of {value_type}. FITS Headers can "
-                                     "only use numbers and ASCII strings. "
-                                     "Converting it to a string."
-                                      .format(key=keydex, value=str(valuedex), 
-                                              value_type=type(valuedex))))
-            # Convert to a fits proper type.
+                                     "({key} = {value}) uses a value "
+                                     "type of {value_type}. FITS "
+                                     "Headers can only use numbers and "
+                                     "ASCII strings. Converting it to "
+                                     "a string."
+                                     .format(key=keydex, 
+                                             value=str(valuedex), 
+                                             value_type=type(valuedex))))
+            # Convert to a fits proper type. Cards which are too 
+            # long (>=80) are split into CONTINUE cards by Astropy.
             converted_value = str(valuedex)
+        # Change the header.
+        hdu_header.set(keydex, converted_value, 
+                       comment_cards.get(keydex,None))
+    return hdu_header
+
+def append_astropy_header_card(file_name, header_cards, comment_cards=None):
+    """ This is a function to add header card entries into the 
+    header of a fits file. This uses dictionaries to achieve said 
+    result.
 
-            # If the key, value and comment card entry is too big, 
-            # (>=80) it is better to open and write the entire file 
-            # for the CONTINUE card.
-            card_length = (len(keydex) 
-                           + len(str(converted_value)) 
-                           + len(str(comment_cards.get(keydex,''))))
-            if (card_length >= 80):
-                __, hdu_header, hdu_data = read_fits_file(
-                    file_name=file_name, extension=0, silent=True)
-                # Change the header.
-                hdu_header.set(keydex, converted_value, 
-                               comment_cards.get(keydex,None))
-                # Finally, over/re-write the file to save the change.
-                write_fits_file(file_name=file_name, 
-                                hdu_header=hdu_header, hdu_data=hdu_data, 
-                                hdu_object=None,
-                                save_file=True, overwrite=True, silent=True)
-            else:
-                ap_fits.setval(file_name, keydex, value=converted_value, 
-                               comment=comment_cards.get(keydex,None))
+    Parameters
+    ----------
+    file_name : string
+        This is the path of the file to be written, either relative 
+        or absolute.
+    header_cards : dictionary
+        The header entries to be added to the header file. Please 
+        note that the keys of the dictionary must be no more than 
+        8 characters; otherwise a HIERARCH card will be used.
+    comment_cards : dictionary (optional)
+        The comment entries to be added to the header file. The 
+        keys of the comment dictionary and the `header_cards` must 
+        line up.
+
+    Returns
+    -------
+    hdul_file : Astropy PrimaryHDU
+        The file object that was written to disk. If ``hdu_object`` 
+        was provided, it is returned with its header changed.
+    """
+    # Open the file only once in update mode. All of the cards are 
+    # added to the header in memory and Astropy flushes them when the 
+    # file is closed. If the new cards still fit within the padding 
+    # of the original header blocks, only the header is rewritten in 
+    # place; otherwise Astropy handles the resizing of the file.
+    with ap_fits.open(file_name, mode='update') as hdul_file:
+        __ = update_astropy_header(hdu_header=hdul_file[0].header, 
+                                   header_cards=header_cards,
+                                   comment_cards=comment_cards)
     return None
         
 
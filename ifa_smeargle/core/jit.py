@@ -0,0 +1,38 @@
+"""
+This contains the common functions for the optional compilation of 
+functions with Numba. Numba is not required; without it, the 
+functions remain plain Python functions and their callers should 
+use their Numpy based alternatives instead.
+"""
+
+# Numba is optional. If it is not installed, then this is None.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def optional_jit(**jit_arguments):
+    """ A decorator which compiles the function with Numba, provided 
+    the arguments, if Numba is installed. Otherwise, the function is 
+    returned unchanged.
+
+    Parameters
+    ----------
+    **jit_arguments : dictionary
+        The arguments that are given to `numba.njit`.
+
+    Returns
+    -------
+    decorator : function
+        The decorator which compiles the function, if possible.
+    """
+    def decorator(function):
+        if (numba is None):
+            return function
+        else:
+            return numba.njit(**jit_arguments)(function)
+    return decorator
+
+# Numba's parallel range, only parallel when compiled.
+prange = numba.prange if (numba is not None) else range
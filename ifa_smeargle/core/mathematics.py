@@ -5,6 +5,13 @@ import astropy as ap
 import astropy.modeling as ap_mod
 import sympy as sy
 
+# Bottleneck is optional, it provides faster nan-ignoring 
+# reductions. Numpy's versions are used if it is not installed.
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
 import ifa_smeargle.core as core
 
 def ifas_masked_mean(array, axis=None):
@@ -29,24 +36,17 @@ def ifas_masked_mean(array, axis=None):
         The mean of the array along which ever axis was given. 
     """
 
-    # Fix all invalid data before taking the mean.
-    valid_array = np_ma.fix_invalid(array)
-
-    # Test to see if there is any invalid data left.
-    if (np.any(np.isnan(valid_array))):
-        raise core.error.DataError("The array still contains invalid nan "
-                                   "data after the invalid data was fixed. "
-                                   "The true mean function will not work "
-                                   "as expected.")
-    if (np.any(np.isinf(valid_array))):
-        raise core.error.DataError("The array still contains invalid inf "
-                                   "data after the invalid data was fixed. "
-                                   "The true mean function will not work "
-                                   "as expected.")
+    # Invalid and masked data are both treated as nans so that they 
+    # are ignored when taking the mean.
+    nan_array = _nan_filled_array(array=array)
 
-    # Calculate and return the mean. The masked array version of the 
-    # functions seems to properly ignore masks as intended.
-    true_mean = np_ma.mean(valid_array, axis=axis)
+    # Calculate and return the mean. Slices without any valid data 
+    # have a nan mean.
+    with core.error.ifas_silence_specific_warnings(RuntimeWarning):
+        if (bn is not None):
+            true_mean = bn.nanmean(nan_array, axis=axis)
+        else:
+            true_mean = np.nanmean(nan_array, axis=axis)
 
     return true_mean
 def ifas_masked_median(array, axis=None):
@@ -70,26 +70,45 @@ def ifas_masked_median(array, axis=None):
     true_median : float or ndarray
         The median of the array along which ever axis was given. 
     """
-    # Fix all invalid data before taking the median.
-    valid_array = np_ma.fix_invalid(array)
+    # Invalid and masked data are both treated as nans so that they 
+    # are ignored when taking the median.
+    nan_array = _nan_filled_array(array=array)
+
+    # Calculate and return the median. Slices without any valid data 
+    # have a nan median.
+    with core.error.ifas_silence_specific_warnings(RuntimeWarning):
+        if (bn is not None):
+            true_median = bn.nanmedian(nan_array, axis=axis)
+        else:
+            true_median = np.nanmedian(nan_array, axis=axis)
 
-    # Test to see if there is any invalid data left.
-    if (np.any(np.isnan(valid_array))):
-        raise core.error.DataError("The array still contains invalid nan "
-                                   "data after the invalid data was fixed. "
-                                   "The true mean function will not work "
-                                   "as expected.")
-    if (np.any(np.isinf(valid_array))):
-        raise core.error.DataError("The array still contains invalid inf "
-                                   "data after the invalid data was fixed. "
-                                   "The true mean function will not work "
-                                   "as expected.")
+    return true_median
 
-    # Calculate and return the median. The masked array version of 
-    # the functions seems to properly ignore masks as intended.
-    true_median = np_ma.median(valid_array, axis=axis)
+def _nan_filled_array(array):
+    """ This returns a float copy of the array where all masked 
+    and invalid (nan or inf) values are replaced with nans. Single 
+    precision arrays (and smaller integers) stay single precision.
 
-    return true_median
+    Parameters
+    ----------
+    array : ndarray
+        The array, masked or not, to be filled.
+
+    Returns
+    -------
+    nan_array : ndarray
+        The float array with nans in place of masked or invalid 
+        values.
+    """
+    # The copy is required as the filling should not change the 
+    # original array.
+    raw_array = np_ma.getdata(array)
+    nan_array = np.array(raw_array, copy=True,
+                         dtype=np.promote_types(raw_array.dtype, np.float32))
+    invalid_mask = np.logical_or(np_ma.getmaskarray(array), 
+                                 ~np.isfinite(nan_array))
+    nan_array[invalid_mask] = np.nan
+    return nan_array
 
 def ifas_masked_std(array, axis=None):
     """ This returns the true standard deviation of the data. It 
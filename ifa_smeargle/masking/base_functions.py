@@ -3,6 +3,9 @@ This is the common functions that are used through the masking
 modules.
 """
 
+import concurrent.futures
+import hashlib
+import json
 import numpy as np
 import os
 import string
@@ -10,6 +13,11 @@ import string
 import ifa_smeargle.core as core
 import ifa_smeargle.masking as mask
 
+
+# The name of the sidecar file, kept beside the masks, which records 
+# the state of the data and parameters that each mask was made from.
+_MASK_CACHE_FILENAME = '.ifas_mask_cache.json'
+
 def get_mask_fits_filenames(data_directory, recursive=False):
     """ This function is to obtain all of the mask fits files within
     the directory provided. Mask fits files are those that have the 
@@ -68,8 +76,8 @@ def get_filter_fits_filenames(data_directory, recursive=False):
 
 
 def create_directory_mask_file(data_directory, mask_function, mask_arguments,
-                               mask_file_name, 
-                               recursive=False, subfolder=True, run=False):
+                               mask_file_name, recursive=False, 
+                               subfolder=True, run=False, cache=False):
     """ This function is the common function to create a mask 
     for the data within the data directory.
 
@@ -92,6 +100,12 @@ def create_directory_mask_file(data_directory, mask_function, mask_arguments,
     run : boolean (optional)
         If True, the mask is ran and completed. Else, a warning is 
         raised, it is not computed, and nothing is returned.
+    cache : boolean (optional)
+        If True, the mask is skipped if it already exists and was 
+        created by the same masking function and arguments from data 
+        files which have not been modified since; if it is out of 
+        date, it is replaced. Masks with random names are not 
+        cached. See `_MASK_CACHE_FILENAME`.
 
     Returns
     -------
@@ -123,55 +137,6 @@ def create_directory_mask_file(data_directory, mask_function, mask_arguments,
                                             sub_extension=None, 
                                             recursive=recursive)
 
-    # Masks only need to derive their shape based on one data frame
-    # based on their size and shape. However, ensure that the size
-    # and shape of all files are valid. Assume that the first data
-    # file is always the correct one.
-    core.error.ifas_info("Creating a mask based on the data shape of "
-                         "{correct_file}. This is the first file obtained "
-                         "and shall be dogmatically assumed correct."
-                         .format(correct_file=data_files[0]))
-    __, hdu_header, hdu_data = core.io.read_fits_file(
-        file_name=data_files[0], extension=0, silent=True)
-    correct_shape = hdu_data.shape
-    correct_size = hdu_data.size
-    # Loop through all others to test the other data arrays.
-    for filedex in data_files:
-        # Load the file temporarily.
-        __, __, temp_data = core.io.read_fits_file(file_name=filedex,
-                                                   extension=0, silent=True)
-        if (temp_data.size != correct_size):
-            # Inform the user that these files have different number
-            # of data points.
-            core.error.ifas_error(core.error.DataError,
-                                  "The data file `{data_file}` has "
-                                  "{data_pts} data points. The first, "
-                                  "correct, data file has {correct_pts}. "
-                                  .format(data_file=str(filedex),
-                                          data_pts=temp_data.size,
-                                          correct_pts=correct_size))
-        if (temp_data.shape != correct_shape):
-            # The two shapes of the data files are incorrect. As the 
-            # masks themselves are based on dimensions, it cannot 
-            # be ignored.
-            raise core.error.DataError("The data file `{data_file}` has the "
-                                       "shape: {data_shape}. The assumed "
-                                       "correct shape is: {correct_shape}. "
-                                       "A single uniform mask cannot be "
-                                       "applied to data files with "
-                                       "different dimensional shapes."
-                                       .format(data_file=str(filedex),
-                                               data_shape=temp_data.shape,
-                                               correct_shape=correct_shape))
-        
-
-    # The files, if here, are of correct shape, and correct-enough 
-    # size. Create the mask itself.
-    data_mask = mask_function(data_array=hdu_data, **mask_arguments)
-    # Astropy fits files do not like booleans, convert to 1/0
-    int_data_mask = np.where(data_mask, 1, 0)
-
-
     # If the user didn't create a valid mask name, provide one 
     # for them.
     if ((len(str(mask_file_name)) == 0) or (mask_file_name is None)):
@@ -183,6 +148,9 @@ def create_directory_mask_file(data_directory, mask_function, mask_arguments,
                                  "provided. The random name `{rand_name}` "
                                  "shall be used instead."
                                  .format(rand_name=mask_file)))
+        # A random name is never used again, so the mask would never 
+        # be found in the cache.
+        cache = False
     else:
         # In the event that there is any path information within the 
         # mask file name; removing it and modify it to its proper 
@@ -213,7 +181,73 @@ def create_directory_mask_file(data_directory, mask_function, mask_arguments,
         mask_filename = core.strformat.combine_pathname(
             directory=[data_directory], file_name=[mask_file], 
             extension=['.mask','.fits'])
-    
+
+    # If the mask has already been created from the same unmodified 
+    # data, with the same parameters, it does not need to be redone.
+    if (cache):
+        mask_cache = _read_mask_cache(mask_filename=mask_filename)
+        mask_hash = _compute_mask_cache_hash(data_files=data_files, 
+                                             mask_function=mask_function,
+                                             mask_arguments=mask_arguments)
+        if ((mask_cache.get(mask_filename, None) == mask_hash) 
+            and (os.path.isfile(mask_filename))):
+            core.error.ifas_info("The `{mask_type}` mask at `{mask_path}` "
+                                 "is up to date with its data and "
+                                 "parameters. It will not be recreated."
+                                 .format(mask_type=str(mask_function.__name__),
+                                         mask_path=mask_filename))
+            return None
+
+    # Masks only need to derive their shape based on one data frame
+    # based on their size and shape. However, ensure that the size
+    # and shape of all files are valid. Assume that the first data
+    # file is always the correct one.
+    core.error.ifas_info("Creating a mask based on the data shape of "
+                         "{correct_file}. This is the first file obtained "
+                         "and shall be dogmatically assumed correct."
+                         .format(correct_file=data_files[0]))
+    __, hdu_header, hdu_data = core.io.read_fits_file(
+        file_name=data_files[0], extension=0, silent=True)
+    correct_shape = hdu_data.shape
+    correct_size = hdu_data.size
+    # Loop through all others to test the other data arrays. Only 
+    # their headers need to be read for this; as it is mostly 
+    # waiting on the disk, they are read in parallel threads.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=core.runtime.get_parallel_workers()) as executor:
+        data_shapes = list(executor.map(core.io.read_fits_shape, data_files))
+    for filedex, temp_shape in zip(data_files, data_shapes):
+        temp_size = int(np.prod(temp_shape))
+        if (temp_size != correct_size):
+            # Inform the user that these files have different number
+            # of data points.
+            core.error.ifas_error(core.error.DataError,
+                                  "The data file `{data_file}` has "
+                                  "{data_pts} data points. The first, "
+                                  "correct, data file has {correct_pts}. "
+                                  .format(data_file=str(filedex),
+                                          data_pts=temp_size,
+                                          correct_pts=correct_size))
+        if (temp_shape != correct_shape):
+            # The two shapes of the data files are incorrect. As the 
+            # masks themselves are based on dimensions, it cannot 
+            # be ignored.
+            raise core.error.DataError("The data file `{data_file}` has the "
+                                       "shape: {data_shape}. The assumed "
+                                       "correct shape is: {correct_shape}. "
+                                       "A single uniform mask cannot be "
+                                       "applied to data files with "
+                                       "different dimensional shapes."
+                                       .format(data_file=str(filedex),
+                                               data_shape=temp_shape,
+                                               correct_shape=correct_shape))
+
+    # The files, if here, are of correct shape, and correct-enough 
+    # size. Create the mask itself.
+    data_mask = mask_function(data_array=hdu_data, **mask_arguments)
+    # Astropy fits files do not like booleans, convert to 1/0
+    int_data_mask = np.where(data_mask, 1, 0)
+
 
     # The mask file will be saved. However, the header information
     # is important.
@@ -236,13 +270,21 @@ def create_directory_mask_file(data_directory, mask_function, mask_arguments,
         comment_cards[keydex] = 'A configuration used for this mask.'
 
 
-    # Write the file to disk, then the header information.
+    # Write the file to disk, then the header information. A cached 
+    # mask which is out of date is replaced.
+    replace_mask = (cache and (mask_filename in mask_cache))
     core.io.write_fits_file(file_name=mask_filename, 
                             hdu_header=hdu_header, hdu_data=int_data_mask,
-                            save_file=True, overwrite=False, silent=True)
+                            save_file=True, overwrite=replace_mask, 
+                            silent=True)
     core.io.append_astropy_header_card(file_name=mask_filename, 
                                        header_cards=header_cards, 
                                        comment_cards=comment_cards)
+    # Record the newly created mask so that it can be skipped later.
+    if (cache):
+        mask_cache[mask_filename] = mask_hash
+        _write_mask_cache(mask_filename=mask_filename, 
+                          mask_cache=mask_cache)
     core.error.ifas_info("The `{mask_type}` mask has been written "
                          "to `{mask_path}`."
                          .format(mask_type=str(mask_function.__name__),
@@ -451,12 +493,13 @@ def synthesize_masks(*args, **kwargs):
         # It is assumed that there are masks to synthesize.
         # Assume that the first mask is the correct size and shapes, 
         # and shall be the template.
-        synthesized_mask = np.zeros_like(np.array(args[0]), dtype=bool)
+        synthesized_mask = np.zeros(np.shape(args[0]), dtype=bool)
         correct_size = synthesized_mask.size
         correct_shape = synthesized_mask.shape
         for maskdex, index in zip(args, range(len(args))):
-            # Numpy conversion.
-            mask_array = np.array(maskdex, dtype=bool)
+            # Numpy conversion, without a copy if it is already a 
+            # boolean array.
+            mask_array = np.asarray(maskdex, dtype=bool)
             # Test for the size and shape.
             if (mask_array.shape != correct_shape):
                 raise core.error.DataError("The {num}th mask is not the "
@@ -467,16 +510,16 @@ def synthesize_masks(*args, **kwargs):
                                                    corr_shp=correct_shape,
                                                    curr_shp=mask_array.shape))
             if (mask_array.size != correct_size):
-                core.error.ifas_error(core.eroor.DataError, 
+                core.error.ifas_error(core.error.DataError, 
                                       ("The {num}th mask is not the correct "
                                        "size. Correct shape:  {corr_sze} "
                                        "Nth shape: {curr_sze}"
                                        .format(num=index, 
                                                corr_sze=correct_shape,
                                                curr_sze=mask_array.shape)))
-            # Otherwise, combine the two masks.
-            synthesized_mask = np.array((synthesized_mask + mask_array),
-                                        dtype=bool)
+            # Otherwise, combine the two masks, in place.
+            np.logical_or(synthesized_mask, mask_array, 
+                          out=synthesized_mask)
         # Finished with synthesizing.
         return synthesized_mask
 
@@ -484,3 +527,83 @@ def synthesize_masks(*args, **kwargs):
     # by the else.
     raise core.error.BrokenLogicError
     return None
+
+
+def _compute_mask_cache_hash(data_files, mask_function, mask_arguments):
+    """ This computes the hash that identifies a mask by the data 
+    files it was derived from (including their modification times), 
+    the masking function, and its arguments.
+
+    Parameters
+    ----------
+    data_files : list
+        The data files which the mask is derived from. Mask and filter
+        files are ignored as they are products, not data.
+    mask_function : function
+        The masking function used to create the mask.
+    mask_arguments : dictionary
+        The dictionary for the arguments of the masking function.
+
+    Returns
+    -------
+    mask_hash : string
+        The hexadecimal digest of the hash.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for filedex in sorted(data_files):
+        if (filedex.endswith(('.mask.fits', '.filter.fits'))):
+            continue
+        hasher.update(''.join([filedex, '@', 
+                               str(os.stat(filedex).st_mtime_ns), 
+                               ';']).encode())
+    hasher.update(str(mask_function.__name__).encode())
+    hasher.update(repr(sorted(mask_arguments.items(), 
+                              key=lambda item: str(item[0]))).encode())
+    return hasher.hexdigest()
+
+def _read_mask_cache(mask_filename):
+    """ This reads the mask cache beside the provided mask file. A 
+    missing or unreadable cache is treated as empty.
+
+    Parameters
+    ----------
+    mask_filename : string
+        The mask file whose directory contains the cache.
+
+    Returns
+    -------
+    mask_cache : dictionary
+        The mask file names and their hashes.
+    """
+    cache_filename = os.path.join(os.path.dirname(mask_filename), 
+                                  _MASK_CACHE_FILENAME)
+    try:
+        with open(cache_filename, 'r') as cache_file:
+            mask_cache = json.load(cache_file)
+    except (OSError, ValueError):
+        mask_cache = {}
+    return (mask_cache if isinstance(mask_cache, dict) else {})
+
+def _write_mask_cache(mask_filename, mask_cache):
+    """ This writes the mask cache beside the provided mask file. It 
+    is written to a temporary file first and then moved so that the 
+    cache is never left half written.
+
+    Parameters
+    ----------
+    mask_filename : string
+        The mask file whose directory contains the cache.
+    mask_cache : dictionary
+        The mask file names and their hashes.
+
+    Returns
+    -------
+    None
+    """
+    cache_filename = os.path.join(os.path.dirname(mask_filename), 
+                                  _MASK_CACHE_FILENAME)
+    temp_filename = ''.join([cache_filename, '.', str(os.getpid()), '.tmp'])
+    with open(temp_filename, 'w') as cache_file:
+        json.dump(mask_cache, cache_file, indent=1, sort_keys=True)
+    os.replace(temp_filename, cache_filename)
+    return None
@@ -305,8 +305,13 @@ def filter_invalid_value(data_array):
     # As fixing all invalid data is required, masks might obscure 
     # the data itself.
     raw_data_array = np_ma.getdata(data_array)
-    # Mask all of the invalid data.
-    final_mask = np_ma.getmaskarray(np_ma.fix_invalid(raw_data_array))
+    # Mask all of the invalid data. For numerical arrays, the invalid
+    # data are exactly the non-finite values; this can be found in 
+    # one pass without building a masked array.
+    if (raw_data_array.dtype.kind in 'biufc'):
+        final_mask = ~np.isfinite(raw_data_array)
+    else:
+        final_mask = np_ma.getmaskarray(np_ma.fix_invalid(raw_data_array))
 
     return final_mask
 
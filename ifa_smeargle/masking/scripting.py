@@ -2,6 +2,8 @@
 """
 This contains the scripts of the masking functions.
 """
+import collections
+import concurrent.futures
 import numpy as np
 import os
 import string
@@ -10,6 +12,10 @@ import ifa_smeargle.core as core
 import ifa_smeargle.masking as mask
 
 
+# The prefix which all of the mask script functions share; it is used
+# to separate them from the other script functions for batch masking.
+_SCRIPT_MASK_PREFIX = 'script_mask'
+
 # The scripts of the masks.
 def script_mask_single_pixels(config):
     """ The scripting version of `mask_single_pixels`. This function 
@@ -27,23 +33,20 @@ def script_mask_single_pixels(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_single_pixels'])
+    run_flag = flat_config[('geometric','run_mask_single_pixels')]
     # Extract the masking programs configuration parameters.
-    column_indexes = core.config.extract_configuration(
-        config_object=config, keys=['geometric','pixel_column_indexes'])
-    row_indexes = core.config.extract_configuration(
-        config_object=config, keys=['geometric','pixel_row_indexes'])
+    column_indexes = flat_config[('geometric','pixel_column_indexes')]
+    row_indexes = flat_config[('geometric','pixel_row_indexes')]
 
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_single_pixels
@@ -59,7 +62,7 @@ def script_mask_single_pixels(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -80,23 +83,20 @@ def script_mask_rectangle(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_rectangle'])
+    run_flag = flat_config[('geometric','run_mask_rectangle')]
     # Extract the masking programs configuration parameters.
-    column_range = core.config.extract_configuration(
-        config_object=config, keys=['geometric','rectangle_column_range'])
-    row_range = core.config.extract_configuration(
-        config_object=config, keys=['geometric','rectangle_row_range'])
+    column_range = flat_config[('geometric','rectangle_column_range')]
+    row_range = flat_config[('geometric','rectangle_row_range')]
 
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_rectangle
@@ -112,7 +112,7 @@ def script_mask_rectangle(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -133,23 +133,20 @@ def script_mask_subarray(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_subarray'])
+    run_flag = flat_config[('geometric','run_mask_subarray')]
     # Extract the masking programs configuration parameters.
-    column_range = core.config.extract_configuration(
-        config_object=config, keys=['geometric','subarray_column_range'])
-    row_range = core.config.extract_configuration(
-        config_object=config, keys=['geometric','subarray_row_range'])
+    column_range = flat_config[('geometric','subarray_column_range')]
+    row_range = flat_config[('geometric','subarray_row_range')]
 
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_subarray
@@ -165,7 +162,7 @@ def script_mask_subarray(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -186,21 +183,19 @@ def script_mask_columns(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_columns'])
+    run_flag = flat_config[('geometric','run_mask_columns')]
     # Extract the masking programs configuration parameters.
-    column_list = core.config.extract_configuration(
-        config_object=config, keys=['geometric','column_list'])
+    column_list = flat_config[('geometric','column_list')]
 
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_columns
@@ -215,7 +210,7 @@ def script_mask_columns(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -236,21 +231,19 @@ def script_mask_rows(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_rows'])
+    run_flag = flat_config[('geometric','run_mask_rows')]
     # Extract the masking programs configuration parameters.
-    row_list = core.config.extract_configuration(
-        config_object=config, keys=['geometric','row_list'])
+    row_list = flat_config[('geometric','row_list')]
 
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_rows
@@ -265,7 +258,7 @@ def script_mask_rows(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -286,21 +279,17 @@ def script_mask_nothing(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_nothing'])
-    # Extract the masking programs configuration parameters.
-    pass
-
+    run_flag = flat_config[('geometric','run_mask_nothing')]
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_nothing
 
@@ -314,7 +303,7 @@ def script_mask_nothing(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -335,21 +324,17 @@ def script_mask_everything(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['geometric','run_mask_everything'])
-    # Extract the masking programs configuration parameters.
-    pass
-
+    run_flag = flat_config[('geometric','run_mask_everything')]
     # The function that is being used to calculate the masks.
     masking_function = mask.mask_everything
 
@@ -363,7 +348,7 @@ def script_mask_everything(config):
                                          mask_arguments=masking_arguments,
                                          mask_file_name=mask_file_name,
                                          subfolder=subfolder,
-                                         run=run_flag)
+                                         run=run_flag, cache=True)
 
     # All done.
     return None
@@ -390,9 +375,12 @@ def script_batch_masking(config):
                          "All mask scripts will be run according to the "
                          "configuration file.")
 
+    # The configuration parameters of the batch itself.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # A single mask file name is not supported with batch masks.
-    if (len(core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])) != 0):
+    mask_file_name = flat_config[('mask_file_name',)]
+    if (mask_file_name):
         # The base configuration class has an entry for the mask
         # file name. It cannot be kept else the masks will overwrite
         # themselves.
@@ -403,28 +391,16 @@ def script_batch_masking(config):
                                  "file name for all masks. It will be "
                                  "ignored."))
 
-    # Gather all script mask functions. It is best not to use 
-    # the internal functions of runtime even though it is more
-    # efficient.
-    script_functions = core.runtime.get_script_functions()
-    # We only need to run the masking script functions.
-    script_mask_prefix = 'script_mask'
-    for keydex, scriptdex in script_functions.items():
-        if (script_mask_prefix in keydex):
-            core.error.ifas_info("Calling the script mask function: {script}"
-                                 .format(script=keydex))
-            # The mask name should be assigned here and overwritten
-            # else the mask names will be random or the masks will
-            # be overwritten.
-            config['mask_file_name'] = core.strformat.remove_prefix(
-                string=keydex, prefix='script_')
-            # Run the masking script.
-            __ = scriptdex(config=config)
-        elif (script_mask_prefix not in keydex):
-            continue
-        else:
-            # Something is wrong with the keydex.
-            raise core.error.BrokenLogicError
+    # Run all of the script mask functions of this module. The 
+    # registry is built once at import; the mask file names are 
+    # assigned here and overwritten else the mask names will be 
+    # random or the masks will be overwritten.
+    for keydex, scriptdex in _MASK_SCRIPTS.items():
+        core.error.ifas_info("Calling the script mask function: {script}"
+                             .format(script=keydex))
+        config['mask_file_name'] = _MASK_FILE_NAMES[keydex]
+        # Run the masking script.
+        __ = scriptdex(config=config)
 
     # All done.
     return None
@@ -446,23 +422,20 @@ def script_filter_sigma_value(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_sigma_value'])
+    run_flag = flat_config[('filter','run_filter_sigma_value')]
     # Extract the filter programs configuration parameters.
-    sigma_multiple = core.config.extract_configuration(
-        config_object=config, keys=['filter','sigma_multiple'])
-    sigma_iterations = core.config.extract_configuration(
-        config_object=config, keys=['filter','sigma_iterations'])
+    sigma_multiple = flat_config[('filter','sigma_multiple')]
+    sigma_iterations = flat_config[('filter','sigma_iterations')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_sigma_value
@@ -497,23 +470,20 @@ def script_filter_percent_truncation(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_percent_truncation'])
+    run_flag = flat_config[('filter','run_filter_percent_truncation')]
     # Extract the filter programs configuration parameters.
-    top_percent = core.config.extract_configuration(
-        config_object=config, keys=['filter','top_percent'])
-    bottom_percent = core.config.extract_configuration(
-        config_object=config, keys=['filter','bottom_percent'])
+    top_percent = flat_config[('filter','top_percent')]
+    bottom_percent = flat_config[('filter','bottom_percent')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_percent_truncation
@@ -548,23 +518,20 @@ def script_filter_pixel_truncation(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_pixel_truncation'])
+    run_flag = flat_config[('filter','run_filter_pixel_truncation')]
     # Extract the filter programs configuration parameters.
-    top_count = core.config.extract_configuration(
-        config_object=config, keys=['filter','top_count'])
-    bottom_count = core.config.extract_configuration(
-        config_object=config, keys=['filter','bottom_count'])
+    top_count = flat_config[('filter','top_count')]
+    bottom_count = flat_config[('filter','bottom_count')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_pixel_truncation
@@ -598,21 +565,19 @@ def script_filter_maximum_value(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_maximum_value'])
+    run_flag = flat_config[('filter','run_filter_maximum_value')]
     # Extract the filter programs configuration parameters.
-    maximum_value = core.config.extract_configuration(
-        config_object=config, keys=['filter','maximum_value'])
+    maximum_value = flat_config[('filter','maximum_value')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_maximum_value
@@ -646,21 +611,19 @@ def script_filter_minimum_value(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_minimum_value'])
+    run_flag = flat_config[('filter','run_filter_minimum_value')]
     # Extract the filter programs configuration parameters.
-    minimum_value = core.config.extract_configuration(
-        config_object=config, keys=['filter','minimum_value'])
+    minimum_value = flat_config[('filter','minimum_value')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_minimum_value
@@ -694,21 +657,19 @@ def script_filter_exact_value(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_exact_value'])
+    run_flag = flat_config[('filter','run_filter_exact_value')]
     # Extract the filter programs configuration parameters.
-    exact_value = core.config.extract_configuration(
-        config_object=config, keys=['filter','exact_value'])
+    exact_value = flat_config[('filter','exact_value')]
 
     # The function that is being used to calculate the masks.
     filter_function = mask.filter_exact_value
@@ -742,18 +703,17 @@ def script_filter_invalid_value(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
 
     # Extract the run flag for this particular script.
-    run_flag = core.config.extract_configuration(
-        config_object=config, keys=['filter','run_filter_invalid_value'])
+    run_flag = flat_config[('filter','run_filter_invalid_value')]
     # Extract the filter programs configuration parameters.
     pass
 
@@ -791,14 +751,14 @@ def script_synthesize_masks(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    mask_file_name = core.config.extract_configuration(
-        config_object=config, keys=['mask_file_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    mask_file_name = flat_config[('mask_file_name',)]
 
     # If there is a sub-folder, then check the sub-folder itself as
     # default.
@@ -821,17 +781,43 @@ def script_synthesize_masks(config):
                                .format(data_dir=data_directory)))
         return None
 
-    # Extract the mask themselves.
-    mask_data_list = []
-    header_data_list = []
-    for filedex in mask_file_list:
-        __, temp_header, temp_data = core.io.read_fits_file(
-            file_name=filedex, silent=True)
-        header_data_list.append(temp_header)
-        mask_data_list.append(np.array(temp_data, dtype=bool))
-
-    # Combine all of the masks 
-    synthesized_mask = mask.base.synthesize_masks(*mask_data_list) 
+    # Extract the masks and combine them as they are read, rather 
+    # than holding all of them in memory. Reading them is mostly 
+    # waiting on the disk, so a few are read ahead in parallel 
+    # threads. Silencing is global and not thread safe so it is done 
+    # once, here, rather than by each read.
+    parallel_workers = core.runtime.get_parallel_workers()
+    read_ahead_count = 2 * parallel_workers
+    synthesized_mask = None
+    with core.error.ifas_absolute_silence(), \
+         concurrent.futures.ThreadPoolExecutor(
+             max_workers=parallel_workers) as executor:
+        mask_file_queue = collections.deque(mask_file_list)
+        mask_futures = collections.deque()
+        while ((len(mask_file_queue) != 0) or (len(mask_futures) != 0)):
+            # Keep the read ahead masks topped up.
+            while ((len(mask_file_queue) != 0) 
+                   and (len(mask_futures) < read_ahead_count)):
+                mask_futures.append(executor.submit(
+                    core.io.read_fits_file, 
+                    file_name=mask_file_queue.popleft(), silent=False))
+            # Combine the next mask, in order, with the others.
+            __, __, temp_data = mask_futures.popleft().result()
+            temp_mask = np.asarray(temp_data, dtype=bool)
+            if (synthesized_mask is None):
+                # The first mask is considered the correct mask.
+                synthesized_mask = np.array(temp_mask, dtype=bool)
+            elif (temp_mask.shape != synthesized_mask.shape):
+                raise core.error.DataError("The masks are not all the "
+                                           "same shape. Correct shape:  "
+                                           "{corr_shp}  Mask shape: "
+                                           "{curr_shp}"
+                                           .format(
+                                               corr_shp=synthesized_mask.shape,
+                                               curr_shp=temp_mask.shape))
+            else:
+                np.logical_or(synthesized_mask, temp_mask, 
+                              out=synthesized_mask)
 
     # If the user didn't create a valid mask name, provide one 
     # for them.
@@ -874,14 +860,14 @@ def script_synthesize_filters(config):
     -------
     None
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
-    subfolder = core.config.extract_configuration(
-        config_object=config, keys=['subfolder'])
-    filter_tag_name = core.config.extract_configuration(
-        config_object=config, keys=['filter_tag_name'])
+    data_directory = flat_config[('data_directory',)]
+    subfolder = flat_config[('subfolder',)]
+    filter_tag_name = flat_config[('filter_tag_name',)]
     
     # Get all of the data fits file in the directory to work on.
     data_fits = core.io.get_fits_filenames(data_directory=data_directory)
@@ -889,86 +875,101 @@ def script_synthesize_filters(config):
     # Get all of the filter files within this directory too.
     # sub-folder forces the filters into subdirectories which are 
     # custom made, so the recursive is forced True.
+    defacto_recursive = bool(subfolder)
     if (subfolder):
         core.error.ifas_info("As masks exist in the sub-folders as "
                              "indicated by the `subfolder` parameter in the "
                              "configuration file, obtaining filters will be "
                              "recursive with respect to the data directory.")
-        defacto_recursive = True
     # Getting the filter files.
     filter_files = mask.base.get_filter_fits_filenames(
         data_directory=data_directory, recursive=defacto_recursive)
+    # If there are no filters, there is nothing to synthesize.
+    if (len(filter_files) == 0):
+        core.error.ifas_info("There are no filter files in the data "
+                             "directory `{dir}` to synthesize."
+                             .format(dir=data_directory))
+        return None
+
+    # The filter sub-folder and the filter tag name are the same for 
+    # all data files. If the tag name is not a valid input, then
+    # use a default.
+    filter_dir_name = core.runtime.extract_runtime_configuration(
+        config_key='FILTERING_SUBDIR')
+    if ((isinstance(filter_tag_name, str)) and 
+        (len(filter_tag_name) > 0) and
+        (filter_tag_name is not None)): 
+        # Apple the tag that the user provided.
+        filter_tag = filter_tag_name
+        filter_dir_tag = ''.join(['FILTER', '_', filter_tag_name])
+    else:
+        # The defaults.
+        filter_tag = 'SYNTHESIZED'
+        filter_dir_tag = 'FILTER_SYNTHESIZE'
+
+    # Index the filter files by the data files that they used as 
+    # their base. We assume that it can be determined from just name 
+    # matching: filter files are named as their data file name, `__`, 
+    # and then the filter tag. So, each part of a filter file name 
+    # before a `__` may be the name of its data file.
+    data_split = {filedex: core.strformat.split_pathname(pathname=filedex)
+                  for filedex in data_fits}
+    data_filenames = set([filedex for __, filedex, __ in data_split.values()])
+    filter_index = collections.defaultdict(list)
+    for filterfiledex in filter_files:
+        __, filter_filename, __ = core.strformat.split_pathname(
+            pathname=filterfiledex)
+        split_index = filter_filename.find('__')
+        while (split_index >= 0):
+            if (filter_filename[:split_index] in data_filenames):
+                filter_index[filter_filename[:split_index]].append(
+                    filterfiledex)
+            split_index = filter_filename.find('__', split_index + 1)
 
     # Compile and combine all of the filter files that used a given
-    # data file as its base. We assume that it can be determined
-    # from just name matching.
+    # data file as its base. The directories that the synthesized 
+    # filters are written to are kept by their data directory.
+    filter_directories = {}
     for datafiledex in data_fits:
-        # The real data array.
-        __, hdu_header, hdu_data = core.io.read_fits_file(
-            file_name=datafiledex, extension=0, silent=True)
-        # The data filter, assume by default all pixels are good.
-        hdu_filter = np.full_like(hdu_data, False)
-
-        # Search through all filter files.
-        for filterfiledex in filter_files:
-            # Extract the base file names of these files to allow 
-            # for comparison to ensure that the files use the same 
-            # source data file.
-            __, data_filename, __ = core.strformat.split_pathname(
-                pathname=datafiledex)
-            __, filter_filename, __ = core.strformat.split_pathname(
-                pathname=filterfiledex)
-
-            if (data_filename in filter_filename):
-                # They have a large common section in their name; 
-                # they likely share the same data file. Read the 
-                # fits in.
-                __, filter_header, filter_data = core.io.read_fits_file(
-                    file_name=filterfiledex, extension=0, silent=True)
-
-                # Combine this filter with the other ones extracted.
-                # Ignore the mask part, it works perfectly well with
-                # filters.
-                hdu_filter = mask.base.synthesize_masks(hdu_filter,
-                                                        filter_data)
-                # Move on to the next filter.
-                continue
-
-            else:
-                # These files don't likely share the same data file.
-                continue
+        # The data filter, assume by default all pixels are good. 
+        # Only the shape of the real data array is needed.
+        hdu_filter = np.zeros(core.io.read_fits_shape(
+            file_name=datafiledex, extension=0), dtype=bool)
+
+        # Search through only the filter files which share the same 
+        # source data file.
+        dir, file, ext = data_split[datafiledex]
+        for filterfiledex in filter_index.get(file, []):
+            # Read the fits in.
+            __, filter_header, filter_data = core.io.read_fits_file(
+                file_name=filterfiledex, extension=0, silent=True)
+
+            # Combine this filter with the other ones extracted, in 
+            # place. Ignore the mask part, it works perfectly well 
+            # with filters.
+            filter_data = np.asarray(filter_data, dtype=bool)
+            if (filter_data.shape != hdu_filter.shape):
+                raise core.error.DataError("The filter `{filter_file}` is "
+                                           "not the same shape as its data "
+                                           "file `{data_file}`."
+                                           .format(filter_file=filterfiledex,
+                                                   data_file=datafiledex))
+            np.logical_or(hdu_filter, filter_data, out=hdu_filter)
 
         # Deriving the name of the filter file to be written. It 
         # changes depending on user's data directory and the 
         # sub-folder status.
-        dir, file, ext = core.strformat.split_pathname(pathname=datafiledex)
-        filter_dir_name = core.runtime.extract_runtime_configuration(
-            config_key='FILTERING_SUBDIR')
-        # The filter tag name; if it is not a valid input, then
-        # use a default.
-        if ((isinstance(filter_tag_name, str)) and 
-            (len(filter_tag_name) > 0) and
-            (filter_tag_name is not None)): 
-            # Apple the tag that the user provided.
-            filter_tag = filter_tag_name
-            filter_dir_tag = ''.join(['FILTER', '_', filter_tag_name])
-        else:
-            # The defaults.
-            filter_tag = 'SYNTHESIZED'
-            filter_dir_tag = 'FILTER_SYNTHESIZE'
+        # The filter directory is the same for all data files in the 
+        # same directory; it only needs to be made once.
+        if (dir not in filter_directories):
+            filter_directories[dir] = core.strformat.combine_pathname(
+                directory=([dir, filter_dir_name, filter_dir_tag] 
+                           if subfolder else [dir]))
+            os.makedirs(filter_directories[dir], exist_ok=True)
         # Compile the file name for this filter.
         synth_filter_filename = core.strformat.combine_pathname(
-            directory=([dir, filter_dir_name, filter_dir_tag] 
-                       if subfolder else [dir]), 
+            directory=[filter_directories[dir]], 
             file_name=[file, '__', filter_tag], extension=['.filter','.fits'])
-        # Also check if the folder exists, if not, then make it.
-        if (not os.path.isdir(core.strformat.combine_pathname(
-            directory=([dir, filter_dir_name, filter_dir_tag] 
-                       if subfolder else [dir]) ))):
-            # Creating the directory.
-            os.makedirs(core.strformat.combine_pathname(
-                directory=([dir, filter_dir_name, filter_dir_tag] 
-                       if subfolder else [dir])))
 
         # All of the filters have been added to the sum total. Save
         # the sum total.
@@ -978,3 +979,13 @@ def script_synthesize_filters(config):
 
     # All done.
     return None
+
+
+# The registry of the script mask functions, and the mask file names 
+# that batch masking assigns to them. These are static and thus are 
+# computed only once, after all of the scripts above are defined.
+_MASK_SCRIPTS = {keydex: valuedex for keydex, valuedex in globals().items()
+                 if (keydex.startswith(_SCRIPT_MASK_PREFIX) 
+                     and callable(valuedex))}
+_MASK_FILE_NAMES = {keydex: keydex[len('script_'):] 
+                    for keydex in _MASK_SCRIPTS}
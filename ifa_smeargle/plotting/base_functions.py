@@ -4,6 +4,9 @@ These are the base functions that are common to the entire plotting
 functionality.
 """
 
+import concurrent.futures
+import copy
+import functools
 import matplotlib.pyplot as plt
 
 import numpy as np
@@ -61,11 +64,51 @@ def write_plot_file(file_name, figure, title=None, close_figure=True):
                                  "is being used without its closing "
                                  "functionality, Sparrow does not know."))
 
+    # Save to file then remove figure from RAM if specified.
+    file_name = _save_plot_figure(file_name=file_name, figure=figure, 
+                                  title=title)
+    if (close_figure):
+        plt.close(figure)
+        del figure
+        # Inform of the saved and released RAM from the figure.
+        core.error.ifas_info("The figure `{fig_name}` has been saved to "
+                             "disk and the figure instance has been "
+                             "released from memory."
+                             .format(fig_name=file_name))
+    else:
+        # The figure was saved, but the ram was not released.
+        core.error.ifas_info("The figure `{fig_name}` has been saved to "
+                             "disk. The figure instance still was not "
+                             "and may still exist in and use memory."
+                             .format(fig_name=file_name))
+
+    # All done.
+    return None
+
+
+def _save_plot_figure(file_name, figure, title=None):
+    """ This saves a figure to a file, applying the file extension 
+    and title as described in `write_plot_file`. The figure is left 
+    alone afterwards, releasing it is the job of the caller.
+
+    Parameters
+    ----------
+    file_name : string
+        This is the file string name for the figure to be saved. 
+    figure : Matplotlib Figure
+        This is the figure to be saved to a file.
+    title : string (optional)
+        This is the title for the figure plot.
+
+    Returns
+    -------
+    file_name : string
+        The file name that the figure was actually saved to.
+    """
     # Checking or applying file ending configuration.
-    supported_file_types = figure.canvas.get_supported_filetypes()
-    supported_file_types = list(supported_file_types.keys())
-    if (any(('.' + typedex) in file_name[-7:] 
-            for typedex in supported_file_types)):
+    supported_extensions = _get_supported_extensions(
+        canvas_type=type(figure.canvas))
+    if (file_name.lower().endswith(supported_extensions)):
         # The there seems to be a supported file type already in 
         # here.
         pass
@@ -88,25 +131,32 @@ def write_plot_file(file_name, figure, title=None, close_figure=True):
                                      "be applied to the figure. The title "
                                      "will not be applied."))
 
-    # Save to file then remove figure from RAM if specified.
-    figure.savefig(file_name, bbox_inches='tight')
-    if (close_figure):
-        plt.close(figure)
-        del figure
-        # Inform of the saved and released RAM from the figure.
-        core.error.ifas_info("The figure `{fig_name}` has been saved to "
-                             "disk and the figure instance has been "
-                             "released from memory."
-                             .format(fig_name=file_name))
-    else:
-        # The figure was saved, but the ram was not released.
-        core.error.ifas_info("The figure `{fig_name}` has been saved to "
-                             "disk. The figure instance still was not "
-                             "and may still exist in and use memory."
-                             .format(fig_name=file_name))
+    # Save to file. The resolution only applies to the rasterized 
+    # parts of the figure.
+    figure.savefig(file_name, bbox_inches='tight', dpi=150)
+    return file_name
 
-    # All done.
-    return None
+
+@functools.lru_cache(maxsize=None)
+def _get_supported_extensions(canvas_type):
+    """ This obtains the file extensions that a type of figure canvas 
+    can save to. They only depend on the canvas type (i.e. backend), 
+    so they are cached.
+
+    Parameters
+    ----------
+    canvas_type : type
+        The class of the figure canvas.
+
+    Returns
+    -------
+    supported_extensions : tuple
+        The supported file extensions, with their leading dot.
+    """
+    supported_extensions = tuple(
+        ''.join(['.', typedex]) 
+        for typedex in canvas_type.get_supported_filetypes().keys())
+    return supported_extensions
 
 
 def create_directory_plot_files(data_directory, plotting_function,
@@ -147,39 +197,163 @@ def create_directory_plot_files(data_directory, plotting_function,
         data_directory=data_directory, recursive=False)
 
     # For each of the files, read them, plot, and write the plot
-    # to file.
-    for filedex in analysis_file_list:
-        # Read the file into memory.
-        __, hdu_header, hdu_data= core.io.read_fits_file(file_name=filedex, 
-                                                         silent=True)
-        # If the data array has a mask, then it will be shown as
-        # nans. Masked arrays are the best way to handle this.
-        masked_array = np_ma.fix_invalid(hdu_data)
-        raw_data = np_ma.getdata(masked_array)
-        mask = np_ma.getmaskarray(masked_array)
-
-        # Creating the figure that will be saved.
-        fig, ax = plt.subplots(1, 1,**figure_arguments)
-
-        # Run the plotting function to create the plot that is 
-        # desired.
-        plot = plotting_function(data_array=hdu_data, data_header=hdu_header, 
-                                 data_mask=mask, figure_axes=None,
-                                 matplotlib_arguments=matplotlib_arguments,
-                                 **plot_arguments)
-        ax = plot
-
-        # The file name of the plot. The core will generally be the 
-        # root file name. The second path name split removes the
-        # .analysis from the file name as well.
-        dir, file_analysis, __ = core.strformat.split_pathname(pathname=filedex)
-        __, file, __ = core.strformat.split_pathname(pathname=file_analysis)
-        figure_filename = core.strformat.combine_pathname(
-            directory=[dir],
-            file_name=[file, '__', plotting_function.__name__])
-
-        # Save the plot to file.
-        write_plot_file(file_name=figure_filename, figure=fig, 
-                        title=None, close_figure=True)
-
-    # All done?
\ No newline at end of file
+    # to file. The files are independent of each other, so they are 
+    # plotted in parallel processes if there are enough of them.
+    parallel_workers = min(core.runtime.get_parallel_workers(), 
+                           len(analysis_file_list))
+    plot_one_arguments = {'plotting_function':plotting_function, 
+                          'figure_arguments':figure_arguments,
+                          'plot_arguments':plot_arguments, 
+                          'matplotlib_arguments':matplotlib_arguments}
+    if (parallel_workers <= 1):
+        try:
+            for filedex in analysis_file_list:
+                _plot_one(file_name=filedex, **plot_one_arguments)
+        finally:
+            # The reused figures are not needed after all of the 
+            # files are plotted.
+            _close_plot_figures()
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=parallel_workers, 
+            initializer=_plot_worker_initializer) as executor:
+            plot_futures = [executor.submit(_plot_one, file_name=filedex, 
+                                            **plot_one_arguments)
+                            for filedex in analysis_file_list]
+            for futuredex in plot_futures:
+                # Raise any exceptions from the plotting.
+                __ = futuredex.result()
+
+    # All done.
+    return None
+
+
+def _plot_one(file_name, plotting_function, figure_arguments, 
+              plot_arguments, matplotlib_arguments):
+    """ This reads, plots, and writes the plot of a single analysis 
+    file for `create_directory_plot_files`. It is a module level 
+    function so that it may be sent to other processes.
+
+    Parameters
+    ----------
+    file_name : string
+        The analysis fits file to be plotted.
+    plotting_function : function
+        This is the plotting function that will be applied.
+    figure_arguments : dictionary
+        The plotting arguments that will be sent to the function
+        that creates the function.
+    plot_arguments : dictionary
+        Custom arguments that shall be given to the plotting 
+        function.
+    matplotlib_arguments : dictionary
+        Custom arguments that shall be given to the matplotlib 
+        functions. Plotting functions may modify it, so each plot 
+        is given its own copy.
+
+    Returns
+    -------
+    None
+    """
+    # Read the file into memory.
+    __, hdu_header, hdu_data= core.io.read_fits_file(file_name=file_name, 
+                                                     silent=True)
+    # If the data array has a mask, then it will be shown as
+    # nans. Masked arrays are the best way to handle this.
+    masked_array = np_ma.fix_invalid(hdu_data)
+    raw_data = np_ma.getdata(masked_array)
+    mask = np_ma.getmaskarray(masked_array)
+
+    # Obtaining the figure that will be saved, it is reused between
+    # files rather than created anew.
+    fig, ax = _get_plot_figure(figure_arguments=figure_arguments)
+
+    # Run the plotting function to create the plot that is 
+    # desired.
+    plot = plotting_function(data_array=hdu_data, data_header=hdu_header, 
+                             data_mask=mask, figure_axes=ax,
+                             matplotlib_arguments=copy.deepcopy(
+                                 matplotlib_arguments),
+                             **plot_arguments)
+    ax = plot
+
+    # The file name of the plot. The core will generally be the 
+    # root file name. The second path name split removes the
+    # .analysis from the file name as well.
+    dir, file_analysis, __ = core.strformat.split_pathname(pathname=file_name)
+    __, file, __ = core.strformat.split_pathname(pathname=file_analysis)
+    figure_filename = core.strformat.combine_pathname(
+        directory=[dir],
+        file_name=[file, '__', plotting_function.__name__])
+
+    # Save the plot to file. The figure is kept for the next file.
+    figure_filename = _save_plot_figure(file_name=figure_filename, 
+                                        figure=fig, title=None)
+    core.error.ifas_info("The figure `{fig_name}` has been saved to "
+                         "disk. The figure instance is kept for the "
+                         "next plot."
+                         .format(fig_name=figure_filename))
+    return None
+
+def _get_plot_figure(figure_arguments):
+    """ This obtains a cleared figure and axes to plot on. Creating 
+    figures is expensive, so a figure is only created once per 
+    process for each set of figure arguments and is cleared for 
+    every plot thereafter.
+
+    Parameters
+    ----------
+    figure_arguments : dictionary
+        The plotting arguments that will be sent to the function
+        that creates the figure.
+
+    Returns
+    -------
+    figure : Matplotlib Figure
+        The cleared figure, it is also made the current figure.
+    axes : Matplotlib Axes
+        The only axes on the figure, it is also made the current 
+        axes.
+    """
+    figure_key = repr(sorted(figure_arguments.items()))
+    figure = _PLOT_FIGURES.get(figure_key, None)
+    if ((figure is not None) and plt.fignum_exists(figure.number)):
+        # Clearing the entire figure, not just the axes, as some 
+        # plots (e.g. heat-maps) add their own color-bar axes.
+        figure.clear()
+        axes = figure.add_subplot(1, 1, 1)
+        plt.figure(figure.number)
+        plt.sca(axes)
+    else:
+        # Creating the figure for the first time, or again if it 
+        # had been closed by someone else.
+        figure, axes = plt.subplots(1, 1, **figure_arguments)
+        _PLOT_FIGURES[figure_key] = figure
+    return figure, axes
+
+# The reusable figures of this process, see `_get_plot_figure`.
+_PLOT_FIGURES = {}
+
+def _close_plot_figures():
+    """ This closes all of the reusable figures of this process, 
+    see `_get_plot_figure`, so that they do not remain in the 
+    state of pyplot.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    for figuredex in _PLOT_FIGURES.values():
+        plt.close(figuredex)
+    _PLOT_FIGURES.clear()
+    return None
+
+def _plot_worker_initializer():
+    """ The plotting processes only write to files, so they use the 
+    non-interactive backend. """
+    plt.switch_backend('Agg')
+    return None
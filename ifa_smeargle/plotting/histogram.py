@@ -3,13 +3,11 @@
 This is the function for plotting the histogram and Gaussian fits.
 """
 
-import ast
 import copy
 import matplotlib as mpl
 import matplotlib.patches as mpl_patch
 import matplotlib.pyplot as plt
 import numpy as np
-import numpy.ma as np_ma
 
 import ifa_smeargle.core as core
 import ifa_smeargle.plotting as plot
@@ -37,7 +35,9 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
         provided, plotting parameters which use it will not be plot.
         An error may also be raised.
     data_mask : ndarray (optional)
-        The mask that should be applied to the `data_array`.
+        The mask that should be applied to the `data_array`. The 
+        histogram is plotted from the analysis results in the header,
+        which already account for it; so, it is unused here.
     figure_axes : Matplotlib Axes (optional)
         This is a predefined axes variable that the user may desire 
         to have the heat-map plot to. This defaults to either making 
@@ -47,7 +47,7 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
         These are options the user may use to pass customization 
         parameters into the histogram plot or the Gaussian function
         plot.
-        See :py:func:`~.matplotlib.pyplot.bar` and 
+        See :py:func:`~.matplotlib.pyplot.stairs` and 
         :py:func:`~.matplotlib.pyplot.plot`.
 
     Returns
@@ -81,25 +81,6 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
                                    "analyzed by the proper function to "
                                    "prepare the data for plotting.")
 
-    # If the user provided a mask, apply it. Otherwise, use a blank
-    # mask.
-    if (data_mask is not None):
-        # The mask exists so it shall be applied. Override whatever
-        # the data object itself has.
-        plot_data = np_ma.array(np_ma.getdata(data_array, False), 
-                                mask=data_mask)
-    elif (isinstance(data_array, np_ma.MaskedArray)):
-        # The object is already a masked array, deferring to the 
-        # user here.
-        plot_data = data_array
-        core.error.ifas_info("The provided data array is a masked "
-                             "array. Its mask will be applied to the "
-                             "heat-map.")
-    else:
-        # There is no mask, so none shall be applied.
-        plot_data = np_ma.array(data_array, mask=np_ma.nomask)
-
-
     # First, figure out what type of Matplotlib axes to use.
     if (figure_axes is not None):
         ax = figure_axes
@@ -107,16 +88,37 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
         ax = plt.gca()
 
 
-    # Obtaining the histogram data.
-    hist_bins = np.array(ast.literal_eval(data_header['HIST_BIN']), 
-                         dtype=float)
-    hist_values = np.array(ast.literal_eval(data_header['HIST_VAL']),
-                           dtype=int)
+    # Obtaining the histogram data. They are stored in the header as
+    # the string form of a list; Numpy can parse them directly.
+    hist_bins = np.fromstring(data_header['HIST_BIN'].strip('[]() '), 
+                              sep=',', dtype=float)
+    hist_values = np.fromstring(data_header['HIST_VAL'].strip('[]() '), 
+                                sep=',', dtype=np.int64)
+    # The extrema of the histogram are used for the limits of the 
+    # plot; they only need to be found once.
+    bin_min = np.nanmin(hist_bins)
+    bin_max = np.nanmax(hist_bins)
+    value_max = np.nanmax(hist_values)
 
     # Create the histogram plot manually, rather than recomputing the
-    # entire histogram.
-    ax.bar(hist_bins[:-1], hist_values, width=(hist_bins[1:]-hist_bins[:-1]), 
-           align='edge', **matplotlib_arguments)
+    # entire histogram. It is drawn as a single stepped patch rather 
+    # than a bar per bin. The logarithmic scale is not an argument of 
+    # this patch, so it is applied to the axes instead.
+    matplotlib_arguments = dict(matplotlib_arguments)
+    log_scale = matplotlib_arguments.pop('log', False)
+    if (hasattr(ax, 'stairs')):
+        bars = ax.stairs(hist_values, hist_bins, fill=True, 
+                         **matplotlib_arguments)
+    else:
+        # Older versions of Matplotlib do not have stairs.
+        bars = ax.fill_between(hist_bins, 
+                               np.append(hist_values, hist_values[-1]), 
+                               step='post', **matplotlib_arguments)
+    # Dense histograms are slow and large as vector paths, so only 
+    # the bars are rasterized; the axes and lines stay as vectors.
+    bars.set_rasterized(True)
+    if (log_scale):
+        ax.set_yscale('log', nonpositive='clip')
 
     if (fit_gaussian):
         # Obtain the Gaussian parameters.
@@ -126,22 +128,26 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
         gauss_max = data_header['histogram_max']
 
 
-        # Creating the Gaussian functional fit from the calculated 
-        # parameters.
-        __, gauss_funct = core.math.ifas_gaussian_function(
-            input=0, mean=gauss_mean, stddev=gauss_std, amplitude=gauss_ampli)
-
         # Creating the input to plot. The number of points at this
-        # point is arbitrary but sufficient.
+        # point is arbitrary but sufficient; more points than this 
+        # cannot be distinguished in the plot.
         buffer_factor = 0.2
-        gauss_input = np.linspace((np.nanmin(hist_bins) 
-                                   - (np.abs(np.nanmin(hist_bins))
-                                      * buffer_factor)), 
-                                  (np.nanmax(hist_bins) 
-                                   + (np.abs(np.nanmin(hist_bins)) 
-                                      * buffer_factor)), 
-                                  (100 + hist_bins.size**2), endpoint=True)
-        gauss_output = gauss_funct(gauss_input)
+        gauss_points = min(2048, 100 + hist_bins.size*4)
+        gauss_input = np.linspace((bin_min - (np.abs(bin_min) 
+                                              * buffer_factor)), 
+                                  (bin_max + (np.abs(bin_min) 
+                                              * buffer_factor)), 
+                                  gauss_points, endpoint=True)
+
+        # Creating the Gaussian functional fit from the calculated 
+        # parameters. It is evaluated directly, in place, as 
+        # A * exp(-(x - mu)^2 / (2 sigma^2)).
+        gauss_output = gauss_input - gauss_mean
+        gauss_output /= gauss_std
+        np.square(gauss_output, out=gauss_output)
+        gauss_output *= -0.5
+        np.exp(gauss_output, out=gauss_output)
+        gauss_output *= gauss_ampli
 
         # Plot the Gaussian. 
         ax.plot(gauss_input, gauss_output, linewidth=1.5, color='black')
@@ -183,19 +189,16 @@ def plot_gaussian_histogram(data_array, data_header=None, data_mask=None,
 
     # Always auto-adjust the x-axis to fit the histogram properly.
     bound_factor = 0.1
-    left_bound = (np.nanmin(hist_bins) 
-                  - np.abs(np.nanmin(hist_bins)*bound_factor))
-    right_bound = (np.nanmax(hist_bins) 
-                   + np.abs(np.nanmax(hist_bins)*bound_factor))
+    left_bound = bin_min - np.abs(bin_min*bound_factor)
+    right_bound = bin_max + np.abs(bin_max*bound_factor)
     ax.set_xlim(left_bound, right_bound)
 
     # Always auto-adjust y-axis to histogram as it is the data. If
     # log plotting is on, then scale to correct for the sub-1 values
     # too.
     range_factor = 0.1
-    bottom_range = 1.0 if (matplotlib_arguments.get('log', False)) else None
-    top_range = (np.nanmax(hist_values) 
-                 + np.abs(np.nanmax(hist_values))*range_factor)
+    bottom_range = 1.0 if (log_scale) else None
+    top_range = value_max + np.abs(value_max)*range_factor
     ax.set_ylim(bottom_range, top_range)
 
     # That should be it, for naming convention.
@@ -220,10 +223,12 @@ def script_plot_gaussian_histogram(config):
     None
     """
 
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract the global configuration parameters, including 
     # the directory.
-    data_directory = core.config.extract_configuration(
-        config_object=config, keys=['data_directory'])
+    data_directory = flat_config[('data_directory',)]
 
 
     # Compile the configuration parameters for the creation of the 
@@ -233,15 +238,13 @@ def script_plot_gaussian_histogram(config):
     # Extract configuration parameters that the plotting function 
     # itself uses. Parameters for matplotlib's functions are done
     # through `matplotlib_arguments`.
-    fit_gaussian = core.config.extract_configuration(
-        config_object=config, keys=['histogram','fit_gaussian'])
+    fit_gaussian = flat_config[('histogram','fit_gaussian')]
     # Compile the configuration parameters for the plotting function.
     plot_arguments = {'fit_gaussian':fit_gaussian}
 
     # Extract configuration parameters for the inner matplotlib 
     # function that the plotting function uses.
-    log = core.config.extract_configuration(
-        config_object=config, keys=['histogram','log_plot'])
+    log = flat_config[('histogram','log_plot')]
     # Compile the configuration parameters for the matplotlib 
     # function that is the base of the plotting function.
     matplotlib_arguments = {'log':log}
@@ -8,13 +8,37 @@ import ifa_smeargle.core as core
 
 def format_slice_appending_name(reference_frame, averaging_frame):
     """ The formatting for the string alignment for slices. """
-    # This is the delimiter string.
-    RENAMING_DELIMITER = str(core.runtime.extract_runtime_configuration(
-        config_key='RENAMING_DELIMITER'))
+    slice_string = ('_slice{delimiter}{ref_start},{ref_end}-'
+                    '{avg_start},{avg_end}'
+                    .format(delimiter=_get_renaming_delimiter(),
+                            ref_start=reference_frame[0], 
+                            ref_end=reference_frame[-1],
+                            avg_start=averaging_frame[0], 
+                            avg_end=averaging_frame[-1]))
+    return slice_string
 
-    slice_string = ''.join(['_slice', RENAMING_DELIMITER,
-                            str(reference_frame[0]), ',', 
-                            str(reference_frame[-1]), '-', 
-                            str(averaging_frame[0]), ',', 
-                            str(averaging_frame[-1])])
-    return slice_string
\ No newline at end of file
+def reset_renaming_delimiter():
+    """ The renaming delimiter is only read from the runtime 
+    configuration once. If the runtime configuration file is changed
+    during a run, this function should be called so that the new 
+    delimiter is used.
+
+    Returns
+    -------
+    None
+    """
+    global _RENAMING_DELIMITER
+    _RENAMING_DELIMITER = None
+    return None
+
+def _get_renaming_delimiter():
+    """ This gets the renaming delimiter from the runtime 
+    configuration. Reading the runtime configuration is slow, so it 
+    is only read the first time and kept thereafter. """
+    global _RENAMING_DELIMITER
+    if (_RENAMING_DELIMITER is None):
+        _RENAMING_DELIMITER = str(core.runtime.extract_runtime_configuration(
+            config_key='RENAMING_DELIMITER'))
+    return _RENAMING_DELIMITER
+# The renaming delimiter, see `_get_renaming_delimiter`.
+_RENAMING_DELIMITER = None
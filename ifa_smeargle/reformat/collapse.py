@@ -4,21 +4,31 @@ frames; usually by extracting and subtracting subsets of frames and
 normalizing over some time.
 """
 
-import copy
+import concurrent.futures
 import os
 import shutil
+import statistics
 
 
 import numpy as np
 import numpy.ma as np_ma
 
+# Numexpr is optional, it fuses the subtraction and 
+# normalization of the collapsed frames into one pass.
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
 import ifa_smeargle.core as core
 import ifa_smeargle.reformat as reformat
 
 
 def collapse_by_average_endpoints(data_array, start_chunk, end_chunk,
                                   average_method='median', 
-                                  frame_exposure_time=None):
+                                  frame_exposure_time=None, 
+                                  precision='float32', 
+                                  null_nan_frames=False):
     """ This function reads a fits file and computes its end section 
     values.
 
@@ -33,10 +43,12 @@ def collapse_by_average_endpoints(data_array, start_chunk, end_chunk,
         The data array that the average will be taken from.
     start_chunk : array-like
         The exact range of frames from the beginning that will be 
-        averaged as per the averaging method.
+        averaged as per the averaging method. Both ends of the range 
+        are included.
     end_chunk : array-like
         The exact range of frames from the end that will be averaged 
-        as per the averaging method.
+        as per the averaging method. Both ends of the range are 
+        included.
     average_method : string (optional)
         The current available methods for determining the file size 
         that is proper. Defaults to median:
@@ -53,6 +65,14 @@ def collapse_by_average_endpoints(data_array, start_chunk, end_chunk,
         The duration, per frame (in seconds), of each exposure. 
         This is really not used in this function, but, it is added 
         for uniformity with the other functions.
+    precision : string (optional)
+        The floating point precision that the frames are averaged in 
+        and returned as; either 'float32' or 'float64'. Defaults to 
+        float32, which is sufficient for detector data.
+    null_nan_frames : boolean (optional)
+        If True, the frames of the chunks with any nan/null values 
+        are completely nulled, as `core.io.read_fits_file` does for 
+        data that is not memory mapped. Defaults to False.
 
     Returns
     -------
@@ -71,12 +91,14 @@ def collapse_by_average_endpoints(data_array, start_chunk, end_chunk,
         final_data = _collapse_by_averages_mean_function(
             data_array=data_array, 
             start_chunk=start_chunk, end_chunk=end_chunk,
-            divisor=1)
+            divisor=1, precision=precision,
+            null_nan_frames=null_nan_frames)
     elif (average_method == 'median'):
         final_data = _collapse_by_averages_median_function(
             data_array=data_array,
             start_chunk=start_chunk, end_chunk=end_chunk,
-            divisor=1)
+            divisor=1, precision=precision,
+            null_nan_frames=null_nan_frames)
     else:
         # The method is not a valid method of averaging supported.
         raise core.error.InputError("The `average_method` provided is not a "
@@ -88,7 +110,9 @@ def collapse_by_average_endpoints(data_array, start_chunk, end_chunk,
 def collapse_by_average_endpoints_per_second(data_array, 
                                              start_chunk, end_chunk,
                                              frame_exposure_time,
-                                             average_method='median'):
+                                             average_method='median',
+                                             precision='float32',
+                                             null_nan_frames=False):
     """ This function reads a fits file and computes its end section 
     values, normalizing per second.
 
@@ -105,10 +129,12 @@ def collapse_by_average_endpoints_per_second(data_array,
         The data array that the average will be taken from.
     start_chunk : array-like
         The exact range of frames from the beginning that will be 
-        averaged as per the averaging method.
+        averaged as per the averaging method. Both ends of the range 
+        are included.
     end_chunk : array-like
         The exact range of frames from the end that will be averaged 
-        as per the averaging method.
+        as per the averaging method. Both ends of the range are 
+        included.
     frame_exposure_time : float
         The duration, per frame (in seconds), of each exposure. 
         This is really not used in this function, but, it is added 
@@ -125,10 +151,19 @@ def collapse_by_average_endpoints_per_second(data_array,
             each chunk. Even sets use the mean of the 
             middle most two values.
 
+    precision : string (optional)
+        The floating point precision that the frames are averaged in 
+        and returned as; either 'float32' or 'float64'. Defaults to 
+        float32, which is sufficient for detector data.
+    null_nan_frames : boolean (optional)
+        If True, the frames of the chunks with any nan/null values 
+        are completely nulled, as `core.io.read_fits_file` does for 
+        data that is not memory mapped. Defaults to False.
     """
     # Calculating the divisor: the integration time.
     integration_time = (frame_exposure_time 
-                        * (np.median(end_chunk) - np.median(start_chunk)))
+                        * (statistics.median(end_chunk) 
+                           - statistics.median(start_chunk)))
 
     # Type checking the averaging method and ensuring that 
     # case is irrelevant for averaging method selection.
@@ -139,12 +174,15 @@ def collapse_by_average_endpoints_per_second(data_array,
         final_data = _collapse_by_averages_mean_function(
             data_array=data_array,
             start_chunk=start_chunk, end_chunk=end_chunk,
-            divisor=integration_time)
+            divisor=integration_time, precision=precision,
+            null_nan_frames=null_nan_frames)
     elif (average_method == 'median'):
         final_data = _collapse_by_averages_median_function(data_array=data_array,
                                               start_chunk=start_chunk, 
                                               end_chunk=end_chunk,
-                                              divisor=integration_time)
+                                              divisor=integration_time,
+                                              precision=precision,
+                                              null_nan_frames=null_nan_frames)
     else:
         # The method is not a valid method of averaging supported.
         raise core.error.InputError("The `average_method` provided is not a "
@@ -156,7 +194,9 @@ def collapse_by_average_endpoints_per_second(data_array,
 def collapse_by_average_endpoints_per_kilosecond(data_array, 
                                                  start_chunk, end_chunk,
                                                  frame_exposure_time, 
-                                                 average_method='median'):
+                                                 average_method='median',
+                                                 precision='float32',
+                                                 null_nan_frames=False):
     """ This function reads a fits file and computes its end section 
     values, normalizing per kilosecond.
 
@@ -174,10 +214,12 @@ def collapse_by_average_endpoints_per_kilosecond(data_array,
         The data array that the average will be taken from.
     start_chunk : array-like
         The exact range of frames from the beginning that will be 
-        averaged as per the averaging method.
+        averaged as per the averaging method. Both ends of the range 
+        are included.
     end_chunk : array-like
         The exact range of frames from the end that will be averaged 
-        as per the averaging method.
+        as per the averaging method. Both ends of the range are 
+        included.
     frame_exposure_time : float
         The duration, per frame (in seconds), of each exposure. 
         This is really not used in this function, but, it is added 
@@ -194,10 +236,19 @@ def collapse_by_average_endpoints_per_kilosecond(data_array,
             each chunk. Even sets use the mean of the 
             middle most two values.
 
+    precision : string (optional)
+        The floating point precision that the frames are averaged in 
+        and returned as; either 'float32' or 'float64'. Defaults to 
+        float32, which is sufficient for detector data.
+    null_nan_frames : boolean (optional)
+        If True, the frames of the chunks with any nan/null values 
+        are completely nulled, as `core.io.read_fits_file` does for 
+        data that is not memory mapped. Defaults to False.
     """
     # Calculating the divisor: the integration time in seconds.
     integration_time = (frame_exposure_time 
-                        * (np.median(end_chunk) - np.median(start_chunk)))
+                        * (statistics.median(end_chunk) 
+                           - statistics.median(start_chunk)))
     # However, this function desires kiloseconds, therefore, 
     # integration time should be factored down.
     integration_time_kilosecond = integration_time / 1000.0
@@ -212,12 +263,14 @@ def collapse_by_average_endpoints_per_kilosecond(data_array,
         final_data = _collapse_by_averages_mean_function(
             data_array=data_array, 
             start_chunk=start_chunk, end_chunk=end_chunk,
-            divisor=integration_time_kilosecond)
+            divisor=integration_time_kilosecond, 
+            precision=precision, null_nan_frames=null_nan_frames)
     elif (average_method == 'median'):
         final_data = _collapse_by_averages_median_function(
             data_array=data_array,
             start_chunk=start_chunk, end_chunk=end_chunk,
-            divisor=integration_time_kilosecond)
+            divisor=integration_time_kilosecond, 
+            precision=precision, null_nan_frames=null_nan_frames)
     else:
         # The method is not a valid method of averaging supported.
         raise core.error.InputError("The `average_method` provided is not a "
@@ -238,7 +291,9 @@ def _collapse_by_averages_median_function(*args, **kwargs):
         averaging_function=core.math.ifas_masked_median, *args, **kwargs)
 
 def _collapse_by_averages_common_function(data_array, start_chunk, end_chunk,
-                                          divisor, averaging_function):
+                                          divisor, averaging_function, 
+                                          precision='float32', 
+                                          null_nan_frames=False):
     """ This function takes a 3D array and computes its end section 
     values.
 
@@ -254,15 +309,21 @@ def _collapse_by_averages_common_function(data_array, start_chunk, end_chunk,
         have its values calculated from.
     start_chunk : array-like
         The exact range of frames from the beginning that will be 
-        averaged.
+        averaged. Both ends of the range are included.
     end_chunk : array-like
         The exact range of frames from the bottom that will be 
-        averaged.
+        averaged. Both ends of the range are included.
     divisor : float
         An value by which the data frame will be divided by to 
         either act as a normalization or a per-unit factor.
     averaging_function : function
         The function that would be used to combine the arrays.
+    precision : string (optional)
+        The floating point precision that the frames are averaged in 
+        and returned as; either 'float32' or 'float64'.
+    null_nan_frames : boolean (optional)
+        If True, the frames of the chunks with any nan/null values 
+        are completely nulled.
 
     Returns
     -------
@@ -270,12 +331,29 @@ def _collapse_by_averages_common_function(data_array, start_chunk, end_chunk,
         The final data array of the median-ed frames as desired.
     """
 
-    # Check and adapt for a masked array.
+    # The precision to average the frames in. Single precision is 
+    # sufficient for detector data and halves the memory used.
+    precision = str(precision).lower()
+    if (precision == 'float32'):
+        working_dtype = np.float32
+    elif (precision == 'float64'):
+        working_dtype = np.float64
+    else:
+        raise core.error.InputError("The `precision` provided is not a "
+                                    "valid precision. Inputted precision: "
+                                    "{precision}"
+                                    .format(precision=precision))
+
+    # Check and adapt for a masked array. A mask which masks nothing
+    # is the same as no mask at all.
     if (np_ma.isMaskedArray(data_array)):
         raw_data = np_ma.getdata(data_array)
         data_mask = np_ma.getmask(data_array)
+        if ((data_mask is np_ma.nomask) or (not np.any(data_mask))):
+            data_mask = None
     else:
-        raw_data = np.array(data_array)
+        # The data is only read from, a copy is not needed.
+        raw_data = np.asarray(data_array)
         data_mask = None
 
     # Check for too many or too little dimensions; it is important 
@@ -295,45 +373,295 @@ def _collapse_by_averages_common_function(data_array, start_chunk, end_chunk,
                                  "that the 0th axis is the temporal "
                                  "axis."))
 
+    # The averages are taken along the temporal axis; it is much 
+    # faster if each frame is contiguous in memory, as is the case 
+    # for C ordered arrays.
+    if (not raw_data.flags.c_contiguous):
+        raw_data = np.ascontiguousarray(raw_data)
+
     # Allow for swapped, but valid ranges.
-    start_chunk = np.sort(start_chunk)
-    end_chunk = np.sort(end_chunk)
+    start_chunk = _sort_chunk(chunk=start_chunk)
+    end_chunk = _sort_chunk(chunk=end_chunk)
     # Check if the chunks overlap, if they do, this is a problem.
     if (start_chunk[1] >= end_chunk[0]):
         core.error.ifas_error(core.error.ConfigurationError,
                               ("The end of the start_chunk is after the "
                                "start of the end_chunk. The overlap is "
                                "improper and should be fixed."))
+    # The chunk ranges include both of their ends, so the last frame 
+    # of a chunk must exist. Older configurations excluded the end, 
+    # which would otherwise be silently clipped.
+    if ((start_chunk[0] < 0) or (end_chunk[-1] >= raw_data.shape[0])):
+        raise core.error.ConfigurationError("The frame ranges of the "
+                                            "chunks must be within the "
+                                            "{count} frames of the data, "
+                                            "both ends are included. Start "
+                                            "chunk: {start}  End chunk: "
+                                            "{end}"
+                                            .format(count=raw_data.shape[0],
+                                                    start=start_chunk,
+                                                    end=end_chunk))
     # It is unnatural, but not forbidden, to have differing top and 
-    # bottom chunk range values.
-    if (start_chunk.ptp() != end_chunk.ptp()):
+    # bottom chunk range values. The chunks are sorted, so their 
+    # spans are just the difference of their ends.
+    start_span = int(start_chunk[-1]) - int(start_chunk[0])
+    end_span = int(end_chunk[-1]) - int(end_chunk[0])
+    if (start_span != end_span):
         core.error.ifas_warning(core.error.ReductionWarning,
                                 ("The size of the start chunk and end "
                                  "chunk are different sizes, this is "
                                  "unusual but acceptable."))
 
 
-    # Calculate the collapsed frames. The custom collapsing  
-    # functions are needed to handle both nans and masked arrays. 
-    start_collapsed_frame = averaging_function(
-        array=raw_data[start_chunk[0]:start_chunk[-1]],axis=0)
-    end_collapsed_frame = averaging_function(
-        array=raw_data[end_chunk[0]:end_chunk[-1]],axis=0)
-
-    # Subtracting and normalizing over the time span, starting and 
-    # ending at respective midpoints; integer 
-    # multiplication/division is required because of the discrete 
-    # nature of frames.
-    final_raw_data = (end_collapsed_frame - start_collapsed_frame) / divisor
-
-    # Reapply the mask if there was a mask.
+    # The frames of each chunk, the chunk ranges include both of 
+    # their ends. If the data is memory mapped, only these frames are 
+    # read from the file.
+    start_frames = raw_data[start_chunk[0]:start_chunk[-1] + 1]
+    end_frames = raw_data[end_chunk[0]:end_chunk[-1] + 1]
+    if (null_nan_frames):
+        start_frames = _null_nan_frames(frames=start_frames, 
+                                        first_frame=start_chunk[0])
+        end_frames = _null_nan_frames(frames=end_frames, 
+                                      first_frame=end_chunk[0])
+
+    # If possible, the median collapse can be done by a single 
+    # compiled kernel. It cannot handle masks or invalid data.
+    if ((core.jit.numba is not None) and 
+        (averaging_function is core.math.ifas_masked_median) and
+        (data_mask is None) and (raw_data.ndim == 3) and 
+        (start_frames.shape[0] >= 1) and (end_frames.shape[0] >= 1) and
+        np.all(np.isfinite(start_frames)) and np.all(np.isfinite(end_frames))):
+        # Numba does not work with non-native byte orders, which 
+        # fits files usually have, so only the chunks are converted.
+        final_raw_data = np.empty(raw_data.shape[1:], dtype=working_dtype)
+        _median_endpoints_kernel(
+            start_frames=np.ascontiguousarray(start_frames, 
+                                              dtype=working_dtype),
+            end_frames=np.ascontiguousarray(end_frames, dtype=working_dtype),
+            divisor=working_dtype(divisor), output=final_raw_data)
+    else:
+        final_raw_data = _collapse_by_averages_frames(
+            start_frames=start_frames, end_frames=end_frames, 
+            divisor=divisor, averaging_function=averaging_function,
+            working_dtype=working_dtype)
+
+    # Reapply the mask if there was a mask. A pixel of the collapsed 
+    # frame is masked if it was masked in any frame of either chunk.
+    # The collapsed data is already a new array, it is not copied.
     if (data_mask is not None):
-        final_data = np_ma.array(data=final_raw_data, mask=data_mask)
+        if (data_mask.ndim == raw_data.ndim):
+            final_mask = np.logical_or(
+                np.any(data_mask[start_chunk[0]:start_chunk[-1] + 1], axis=0),
+                np.any(data_mask[end_chunk[0]:end_chunk[-1] + 1], axis=0))
+        else:
+            # The mask is assumed to be of the frame already.
+            final_mask = data_mask
+        final_data = np_ma.array(data=final_raw_data, mask=final_mask, 
+                                 copy=False)
     else:
-        final_data = np.array(final_raw_data)
+        final_data = final_raw_data
 
     return final_data
 
+def _null_nan_frames(frames, first_frame):
+    """ Frames with any nan/null values are completely nulled, as 
+    is done when reading fits files. Memory mapped data is not 
+    checked when read so it is done here, but only for the frames 
+    which are actually needed. Send a warning.
+
+    Parameters
+    ----------
+    frames : ndarray
+        The frames to check, the 0th axis is the temporal axis.
+    first_frame : int
+        The frame number of the first of the frames, for the warning.
+
+    Returns
+    -------
+    nulled_frames : ndarray
+        The frames, nulled where needed. If any are nulled, this is
+        a copy; the original frames are not changed.
+    """
+    # Frames which are already completely null need not be nulled 
+    # again, nor warned about.
+    frame_axes = tuple(range(1, frames.ndim))
+    nan_values = np.isnan(frames)
+    nan_frames = (np.any(nan_values, axis=frame_axes) 
+                  & ~np.all(nan_values, axis=frame_axes))
+    if (not np.any(nan_frames)):
+        return frames
+    core.error.ifas_warning(core.error.DataWarning,
+                            ("This 3D data frame has nan/null values. "
+                             "Frames with nan/null values have been "
+                             "completely nulled. \n    Null frames: "
+                             "{fr_list}"
+                             .format(fr_list=(np.flatnonzero(nan_frames) 
+                                              + first_frame))))
+    nulled_frames = np.array(frames, 
+                             dtype=np.promote_types(frames.dtype, np.float32))
+    nulled_frames[nan_frames] = np.nan
+    return nulled_frames
+
+def _sort_chunk(chunk):
+    """ This sorts the frame range of a chunk. Chunks are usually 
+    only two frames, these are ordered directly as it is much 
+    faster than a general sort.
+
+    Parameters
+    ----------
+    chunk : array-like
+        The frame range of the chunk.
+
+    Returns
+    -------
+    sorted_chunk : tuple
+        The sorted frame range.
+    """
+    if (len(chunk) == 2):
+        first, last = chunk
+        if (first <= last):
+            return (first, last)
+        else:
+            return (last, first)
+    else:
+        return tuple(sorted(chunk))
+
+def _collapse_by_averages_frames(start_frames, end_frames, divisor, 
+                                 averaging_function, working_dtype):
+    """ This averages the start and end chunk frames and finds their
+    normalized difference; see `_collapse_by_averages_common_function`.
+
+    Parameters
+    ----------
+    start_frames : ndarray
+        The frames of the start chunk.
+    end_frames : ndarray
+        The frames of the end chunk.
+    divisor : float
+        An value by which the data frame will be divided by.
+    averaging_function : function
+        The function that would be used to combine the arrays.
+    working_dtype : dtype
+        The floating point type that the frames are averaged in.
+
+    Returns
+    -------
+    final_raw_data : ndarray
+        The normalized difference of the averaged frames.
+    """
+    # The frames are collapsed in bands of rows small enough that 
+    # the data of a band stays within the processor cache while it 
+    # is being averaged.
+    frame_shape = start_frames.shape[1:]
+    row_size = int(np.prod(frame_shape[1:], dtype=np.int64))
+    band_frames = max(start_frames.shape[0], end_frames.shape[0], 1)
+    band_rows = max(1, _COLLAPSE_BAND_BYTES 
+                    // (band_frames * row_size 
+                        * np.dtype(working_dtype).itemsize))
+    final_raw_data = np.empty(frame_shape, dtype=working_dtype)
+    for rowdex in range(0, frame_shape[0], band_rows):
+        band = slice(rowdex, rowdex + band_rows)
+        # Calculate the collapsed frames. The custom collapsing  
+        # functions are needed to handle both nans and masked arrays. 
+        start_collapsed_band = averaging_function(
+            array=start_frames[:, band].astype(working_dtype, copy=False), 
+            axis=0)
+        end_collapsed_band = averaging_function(
+            array=end_frames[:, band].astype(working_dtype, copy=False), 
+            axis=0)
+        # Subtracting, starting and ending at respective midpoints, 
+        # and normalizing over the time span; integer 
+        # multiplication/division is required because of the 
+        # discrete nature of frames.
+        if (ne is not None):
+            __ = ne.evaluate('(end_band - start_band) / divisor', 
+                             local_dict={'end_band':end_collapsed_band,
+                                         'start_band':start_collapsed_band,
+                                         'divisor':working_dtype(divisor)},
+                             out=final_raw_data[band], casting='same_kind')
+        else:
+            np.subtract(end_collapsed_band, start_collapsed_band, 
+                        out=final_raw_data[band])
+            final_raw_data[band] /= divisor
+    return final_raw_data
+# The approximate size, in bytes, of the data of a band of rows that 
+# is averaged at once. It is about the size of a processor L2 cache.
+_COLLAPSE_BAND_BYTES = 2**20
+
+
+# The functions below are the compiled kernel for the median 
+# collapse. Numba is optional; without it, they are plain (slow) 
+# Python functions and the kernel is not used.
+
+@core.jit.optional_jit(cache=True)
+def _quickselect(buffer, index):
+    """ This partially sorts the buffer in place so that the value 
+    at the index is the one which would be there if sorted. Hoare 
+    partitioning is used so constant data does not degrade it. """
+    left = 0
+    right = buffer.size - 1
+    while (left < right):
+        pivot = buffer[(left + right) // 2]
+        lowdex = left
+        highdex = right
+        while (lowdex <= highdex):
+            while (buffer[lowdex] < pivot):
+                lowdex += 1
+            while (buffer[highdex] > pivot):
+                highdex -= 1
+            if (lowdex <= highdex):
+                temp = buffer[lowdex]
+                buffer[lowdex] = buffer[highdex]
+                buffer[highdex] = temp
+                lowdex += 1
+                highdex -= 1
+        # Continue only within the side that has the index.
+        if (index <= highdex):
+            right = highdex
+        elif (index >= lowdex):
+            left = lowdex
+        else:
+            break
+    return buffer[index]
+
+@core.jit.optional_jit(cache=True)
+def _buffer_median(buffer):
+    """ The median of the buffer, which is partially sorted in 
+    place. Even sets use the mean of the middle most two values. """
+    half = buffer.size // 2
+    upper = _quickselect(buffer, half)
+    if (buffer.size % 2 == 1):
+        return upper
+    else:
+        # All values before the half index are no more than the 
+        # upper value, the largest of them is the lower middle.
+        lower = buffer[0]
+        for valuedex in range(1, half):
+            if (buffer[valuedex] > lower):
+                lower = buffer[valuedex]
+        return (lower + upper) / 2.0
+
+@core.jit.optional_jit(parallel=True, cache=True)
+def _median_endpoints_kernel(start_frames, end_frames, divisor, output):
+    """ This computes, for each pixel, the difference of the medians
+    of the end and start frames, divided by the divisor. The output 
+    array is filled in place. The divisor should be of the same 
+    precision as the frames and output. """
+    for rowdex in core.jit.prange(output.shape[0]):
+        # The buffers and the arithmetic are in the precision of the 
+        # frames, as in the Numpy based collapse.
+        start_buffer = np.empty(start_frames.shape[0], 
+                                dtype=start_frames.dtype)
+        end_buffer = np.empty(end_frames.shape[0], dtype=end_frames.dtype)
+        medians = np.empty(2, dtype=output.dtype)
+        for columndex in range(output.shape[1]):
+            start_buffer[:] = start_frames[:, rowdex, columndex]
+            end_buffer[:] = end_frames[:, rowdex, columndex]
+            medians[0] = _buffer_median(end_buffer)
+            medians[1] = _buffer_median(start_buffer)
+            output[rowdex, columndex] = (medians[0] - medians[1]) / divisor
+    return None
+
 
 # The functions below are for the scripting interfaces.
 
@@ -376,42 +704,21 @@ def _format_collapse_config(config):
     frame_exposure_time = core.config.extract_configuration(
         config_object=config, keys=['collapse','frame_exposure_time'])
 
-    # Force both the chunks to be in array format for processing.
-    start_chunk = np.array(start_chunk)
-    end_chunk = np.array(end_chunk)
-
-    # If both are one dimensional, assume matching pairs, else, 
-    # populate unless they are the same dimension size or raise for 
-    # non-equal sizes.
-    if (start_chunk.ndim == end_chunk.ndim):
-        # Assume valid procedure and that these arrays are 
-        # parallel. But basic checks are nice.
-        if (start_chunk.shape != end_chunk.shape):
-            raise core.error.ConfigurationError("Both the start chunk and "
-                                                "the end chunk are of same "
-                                                "dimension but different "
-                                                "shape.")
-        if (start_chunk.size != end_chunk.size):
-            raise core.error.ConfigurationError("Both the start chunk and "
-                                                "the end chunk are of same "
-                                                "dimension but different "
-                                                "size.")
-        # They also need to be 2D.
-        if ((start_chunk.ndim == 1) and (end_chunk.ndim == 1)):
-            start_chunk = np.array([start_chunk])
-            end_chunk = np.array([end_chunk])
-        else:
-            # it is assumed that they are fine.
-            pass
-    elif (start_chunk.ndim == 1) and (1 <= end_chunk.ndim):
-        # The start chunks are the minor here and should duplicate 
-        # where needed to match.
-        start_chunk = np.tile(start_chunk, (end_chunk.shape[0],1))
-    elif (end_chunk.ndim == 1) and (1 <= start_chunk.ndim):
-        # The end chunks are the minor here and should duplicate 
-        # where needed to match.
-        end_chunk = np.tile(end_chunk, (start_chunk.shape[0],1))
-    else:
+    # Force both the chunks to be in (at least) 2D array format for 
+    # processing; a single chunk is a single row.
+    start_chunk = np.atleast_2d(start_chunk)
+    end_chunk = np.atleast_2d(end_chunk)
+
+    # Each start chunk must have an end chunk of the same form. If 
+    # there are fewer of one than the other, it is repeated where 
+    # needed to match, without copying. Otherwise, the arrays are 
+    # assumed to be parallel.
+    if (start_chunk.shape[-1] != end_chunk.shape[-1]):
+        raise core.error.ConfigurationError("The start chunk and the end "
+                                            "chunk are different sizes.")
+    try:
+        start_chunk, end_chunk = np.broadcast_arrays(start_chunk, end_chunk)
+    except ValueError:
         raise core.error.ConfigurationError("The start and end chunks are "
                                             "not in a format that can be "
                                             "understood. The simple "
@@ -441,12 +748,13 @@ def _common_collapse_function(config, collapse_function):
     (data_directory, subfolder, start_chunk, end_chunk, 
      average_method, frame_exposure_time) = _format_collapse_config(
          config=config)
+    # The sub-folder name, if needed.
+    collapse_subdir = core.runtime.extract_runtime_configuration(
+        config_key='COLLPASED_SUBDIR')
     # If the sub-folder is to be used, then make it.
     if (subfolder):
         subfolder_path = core.strformat.combine_pathname(
-            directory=[data_directory, 
-                       core.runtime.extract_runtime_configuration(
-                           config_key='COLLPASED_SUBDIR')])
+            directory=[data_directory, collapse_subdir])
         # Create the directory if needed.
         os.makedirs(subfolder_path, exist_ok=True)
         # Inform that the sub-folder will be used.
@@ -476,62 +784,139 @@ def _common_collapse_function(config, collapse_function):
                                  data_dir=data_directory, 
                                  frame_time=frame_exposure_time,
                                  collapse_funct=collapse_function.__name__))
-    for filedex in data_files:
-        # Also, loop over all desired frame chunks that should be 
-        # made. (No longer supported, but left so it does not 
-        # break.)
-        for substartdex, subenddex in zip(start_chunk, end_chunk):
-            # Load the fits file.
-            hdul_file, hdu_header, hdu_data = core.io.read_fits_file(
-                file_name=filedex, extension=0, silent=False)
-            # Process a copy of the data based on the current 
-            # frame data.
-            collapse_data = collapse_function(
-                data_array=copy.deepcopy(hdu_data), 
-                start_chunk=substartdex, end_chunk=subenddex,
-                frame_exposure_time=frame_exposure_time,
-                average_method=average_method)
-            # Create and write the file out with added terms. If the 
-            # subfolder has been requested, save the file in there
-            # instead.
-            dir, file, ext = core.strformat.split_pathname(pathname=filedex)
-            # The sub-folder, if needed, and file name suffix.
-            collpase_subdir = core.runtime.extract_runtime_configuration(
-                config_key='COLLPASED_SUBDIR')
-            slice_suffix = reformat.base.format_slice_appending_name(
-                reference_frame=substartdex, averaging_frame=subenddex)
-            # Constructing the new path.
-            new_path = core.strformat.combine_pathname(
-                directory=([dir, collpase_subdir] if subfolder else [dir]),
-                file_name=[file, slice_suffix],
-                extension=[ext])
-
-            # Write the file to disk.
-            core.io.write_fits_file(
-                file_name=new_path, hdu_header=hdu_header,
-                hdu_data=collapse_data, hdu_object=None,
-                save_file=True, overwrite=False, silent=False)
-            # Add the collapsing meta-data to the header file of 
-            # the new file. This may add IO overhead, but it 
-            # ensures that headers don't get messed up by odd 
-            # references.
-            headers = {'COLPSE_F':collapse_function.__name__,
-                       'FRAVGMTH':average_method,
-                       'STRTFRMS':str(substartdex),
-                       'ENDFRMS':str(subenddex),
-                       'FRM_EXPO':frame_exposure_time}
-            comments = {'COLPSE_F':'The collapsing method used to make this.',
-                       'FRAVGMTH':'The method used to average chunks.',
-                       'STRTFRMS':'The frame range of the start chunk.',
-                       'ENDFRMS':'The frame range of the end chunk.',
-                       'FRM_EXPO':'The frame exposure, in seconds.'}
-            core.io.append_astropy_header_card(file_name=new_path, 
-                                            header_cards=headers,
-                                            comment_cards=comments)
+    # The file name suffixes only depend on the frame chunks, so 
+    # they are the same for all files.
+    slice_suffixes = [reformat.base.format_slice_appending_name(
+        reference_frame=substartdex, averaging_frame=subenddex)
+                      for substartdex, subenddex in zip(start_chunk, end_chunk)]
+
+    # The files are independent of each other, so they are collapsed
+    # in parallel processes if there are enough of them.
+    parallel_workers = min(core.runtime.get_parallel_workers(), 
+                           len(data_files))
+    collapse_one_arguments = {'collapse_function':collapse_function,
+                              'subfolder':subfolder,
+                              'collapse_subdir':collapse_subdir,
+                              'start_chunk':start_chunk, 
+                              'end_chunk':end_chunk,
+                              'average_method':average_method,
+                              'frame_exposure_time':frame_exposure_time,
+                              'slice_suffixes':slice_suffixes}
+    if (parallel_workers <= 1):
+        for filedex in data_files:
+            _collapse_one_file(file_name=filedex, **collapse_one_arguments)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=parallel_workers, 
+            initializer=_collapse_worker_initializer) as executor:
+            collapse_futures = [executor.submit(_collapse_one_file, 
+                                                file_name=filedex, 
+                                                **collapse_one_arguments)
+                                for filedex in data_files]
+            for futuredex in collapse_futures:
+                # Raise any exceptions from the collapsing.
+                __ = futuredex.result()
 
     # Finished, hopefully.
     return None
 
+
+def _collapse_worker_initializer():
+    """ The collapsing processes already work in parallel, so the 
+    compiled kernel only uses one thread in each of them rather 
+    than oversubscribing the processors. """
+    if (core.jit.numba is not None):
+        core.jit.numba.set_num_threads(1)
+    return None
+
+def _collapse_one_file(file_name, collapse_function, subfolder, 
+                       collapse_subdir, start_chunk, end_chunk, 
+                       average_method, frame_exposure_time, 
+                       slice_suffixes):
+    """ This reads, collapses, and writes the collapsed frames of a 
+    single fits file for `_common_collapse_function`. It is a module 
+    level function so that it may be sent to other processes.
+
+    Parameters
+    ----------
+    file_name : string
+        The fits file to be collapsed.
+    collapse_function : function
+        The collapsing function to be used.
+    subfolder : boolean
+        If True, the collapsed files are saved in the sub-folder.
+    collapse_subdir : string
+        The name of the sub-folder.
+    start_chunk : ndarray
+        The starting chunks to process.
+    end_chunk : ndarray
+        The ending chunks to process.
+    average_method : string
+        The method that will be used to average.
+    frame_exposure_time : float
+        The number of seconds that it takes for a frame to be taken.
+    slice_suffixes : list
+        The file name suffixes of each pair of frame chunks.
+
+    Returns
+    -------
+    None
+    """
+    # The path parts of the file, the collapsed files are named 
+    # after it.
+    dir, file, ext = core.strformat.split_pathname(pathname=file_name)
+
+    # Load the fits file, it is the same for all frame chunks. Only
+    # the frames of the chunks are needed, so the data is memory 
+    # mapped rather than all of it being read.
+    hdul_file, hdu_header, hdu_data = core.io.read_fits_file(
+        file_name=file_name, extension=0, silent=False, memmap=True)
+    # Also, loop over all desired frame chunks that should be 
+    # made. (No longer supported, but left so it does not 
+    # break.)
+    for substartdex, subenddex, slice_suffix in zip(start_chunk, end_chunk, 
+                                                    slice_suffixes):
+        # Process the data based on the current frame data. The 
+        # collapsing functions do not modify the data, so it 
+        # need not be copied. Memory mapped data was not checked 
+        # for nan/null frames when read, so the chunks are.
+        collapse_data = collapse_function(
+            data_array=hdu_data, 
+            start_chunk=substartdex, end_chunk=subenddex,
+            frame_exposure_time=frame_exposure_time,
+            average_method=average_method, null_nan_frames=True)
+        # Create and write the file out with added terms. If the 
+        # subfolder has been requested, save the file in there
+        # instead. Constructing the new path.
+        new_path = core.strformat.combine_pathname(
+            directory=([dir, collapse_subdir] if subfolder else [dir]),
+            file_name=[file, slice_suffix],
+            extension=[ext])
+
+        # Add the collapsing meta-data to a copy of the header so 
+        # that the file is written only once. The copy ensures that 
+        # headers don't get messed up by odd references.
+        headers = {'COLPSE_F':collapse_function.__name__,
+                   'FRAVGMTH':average_method,
+                   'STRTFRMS':str(substartdex),
+                   'ENDFRMS':str(subenddex),
+                   'FRM_EXPO':frame_exposure_time}
+        comments = {'COLPSE_F':'The collapsing method used to make this.',
+                   'FRAVGMTH':'The method used to average chunks.',
+                   'STRTFRMS':'The frame range of the start chunk.',
+                   'ENDFRMS':'The frame range of the end chunk.',
+                   'FRM_EXPO':'The frame exposure, in seconds.'}
+        collapse_header = core.io.update_astropy_header(
+            hdu_header=hdu_header.copy(), header_cards=headers, 
+            comment_cards=comments)
+
+        # Write the file to disk.
+        core.io.write_fits_file(
+            file_name=new_path, hdu_header=collapse_header,
+            hdu_data=collapse_data, hdu_object=None,
+            save_file=True, overwrite=False, silent=False)
+    return None
+
 # The scripts of the collapse calculations.
 
 def script_collapse_by_average_endpoints(config):
@@ -49,6 +49,27 @@ def get_configuration_files():
     ----------
     None
 
+    Returns
+    -------
+    config_files : dictionary
+        The configuration files that have been found in the module 
+        and its sub-modules.
+    """
+    # The search is cached, the dictionary is copied so that the 
+    # cached result cannot be changed.
+    config_files = dict(_find_configuration_files())
+    return config_files
+
+# To cache the results so there is less overhead.
+@functools.lru_cache(maxsize=1)
+def _find_configuration_files():
+    """ This function searches the module directory for all of the 
+    configuration files. Use `get_configuration_files` instead.
+    
+    Parameters
+    ----------
+    None
+
     Returns
     -------
     config_files : dictionary
@@ -333,6 +354,27 @@ def extract_runtime_configuration(config_key):
     return config_value
 
 
+def get_parallel_workers():
+    """ This function obtains the maximum number of threads or 
+    processes that should be used to work on many files at once.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    parallel_workers : int
+        The number of workers, from the `PARALLEL_WORKERS` runtime 
+        configuration. If it is 0, the number of processors is used.
+    """
+    parallel_workers = int(extract_runtime_configuration(
+        config_key='PARALLEL_WORKERS'))
+    if (parallel_workers <= 0):
+        parallel_workers = os.cpu_count() or 1
+    return parallel_workers
+
+
 # This is an index of all of the parameters that change at runtime,
 # rather than a simple program configuration. These variables are
 # used across all scripts, for all functions. Their global nature
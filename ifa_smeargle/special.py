@@ -4,7 +4,7 @@ This is a special file. It contains many script functions which
 do not fit the normal work-flow of this package.
 """
 
-import pathlib
+import os
 import numpy as np
 
 import ifa_smeargle.core as core
@@ -41,7 +41,7 @@ def script_special_create_configuration_file(config):
 
     # In order to copy the configuration into the current working
     # directory, the directory path must be known.
-    current_directory = pathlib.Path().absolute()
+    current_directory = os.getcwd()
 
     # Copy the tutorial configuration into the current directory.
     config_path = core.config.copy_configuration_file(
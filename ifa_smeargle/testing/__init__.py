@@ -10,9 +10,11 @@ import ifa_smeargle.testing.base_functions as base
 # These are tests that are global and apply to the entire library
 # rather than a subset of it.
 from ifa_smeargle.testing.test_global import *
+from ifa_smeargle.testing.test_masking_cache import *
 
 
 # These are numerical based tests, they check for the accuracy of
 # computed values through this library.
 from ifa_smeargle.testing.test_numerical_masking import *
-from ifa_smeargle.testing.test_numerical_filters import *
\ No newline at end of file
+from ifa_smeargle.testing.test_numerical_filters import *
+from ifa_smeargle.testing.test_numerical_reformat import *
@@ -1,9 +1,10 @@
-
 """
 This contains a lot of functions that are common across all of the
 testing functions and modules.
 """
 
+import functools
+
 import numpy as np
 
 import ifa_smeargle.core as core
@@ -26,11 +27,60 @@ def create_prime_test_array(shape, index=0):
         The array filled with prime numbers.
     """
 
+    # The shape must be hashable to be cached.
+    shape = tuple(np.atleast_1d(shape).tolist())
+
     # And the numbers that create the array.
-    test_array_values = core.math.generate_prime_numbers(
-        index=index, count=np.prod(shape))
+    if (index < 0):
+        # Randomly chosen prime numbers can only be provided by the 
+        # prime number list, and they should not be cached.
+        test_array_values = core.math.generate_prime_numbers(
+            index=index, count=int(np.prod(shape)))
+        prime_test_array = np.reshape(test_array_values, shape)
+    else:
+        # The same arrays are used by many tests. A copy is given so 
+        # that a test cannot change the array of another.
+        prime_test_array = _build_prime_test_array(
+            shape=shape, index=int(index)).copy()
+    # All done.
+    return prime_test_array
+
+@functools.lru_cache(maxsize=None)
+def _build_prime_test_array(shape, index):
+    """ This builds the prime test array, ordered from the prime 
+    number at the index. The results are cached and read-only; use 
+    `create_prime_test_array` instead.
+
+    Parameters
+    ----------
+    shape : tuple
+        The shape of the data array.
+    index : integer
+        The non-negative index that the prime numbers should start 
+        from.
+
+    Returns
+    -------
+    prime_test_array : ndarray
+        The read-only array filled with prime numbers.
+    """
+    # The number of prime numbers needed to fill the array.
+    count = int(np.prod(shape))
+
+    # A sieve of Eratosthenes is much faster than reading the prime 
+    # number list. The upper bound of the n-th prime, 
+    # n (ln n + ln ln n), is only valid for n >= 6.
+    n_primes = max(index + count, 6)
+    sieve_size = int(n_primes * (np.log(n_primes) 
+                                 + np.log(np.log(n_primes)))) + 1
+    sieve = np.ones(sieve_size, dtype=bool)
+    sieve[:2] = False
+    for primedex in range(2, int(np.sqrt(sieve_size)) + 1):
+        if (sieve[primedex]):
+            sieve[primedex * primedex::primedex] = False
+    test_array_values = np.flatnonzero(sieve)[index:index + count]
 
     # And reshape into the correct array shape.
     prime_test_array = np.reshape(test_array_values, shape)
-    # All done.
-    return prime_test_array
\ No newline at end of file
+    prime_test_array.setflags(write=False)
+    return prime_test_array
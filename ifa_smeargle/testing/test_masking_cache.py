@@ -0,0 +1,161 @@
+"""
+This tests the mask cache to ensure that masks are only recreated 
+when their data or parameters change.
+
+The masks are created by a counting masking function, the number of 
+times it is called is the number of times the mask was created.
+"""
+
+import json
+import os
+
+import astropy.io.fits as ap_fits
+import numpy as np
+import pytest
+
+import ifa_smeargle.core as core
+import ifa_smeargle.masking as mask
+
+
+def _create_cache_test_directory(directory):
+    """ This writes a few small data files for the mask cache tests. 
+    
+    Parameters
+    ----------
+    directory : string
+        The directory that the data files are written to.
+
+    Returns
+    -------
+    data_files : list
+        The file names of the data files.
+    """
+    data_files = []
+    for filedex in range(2):
+        data_file = os.path.join(directory, 
+                                 'data_{num}.fits'.format(num=filedex))
+        ap_fits.PrimaryHDU(np.zeros((3, 4), dtype=np.int32)).writeto(data_file)
+        data_files.append(data_file)
+    return data_files
+
+def _create_cached_mask(directory, mask_calls, mask_file_name='cached', 
+                        value=1):
+    """ This creates the mask of the mask cache tests, counting the 
+    calls of the masking function.
+
+    Parameters
+    ----------
+    directory : string
+        The data directory that the mask is for.
+    mask_calls : list
+        The calls of the masking function are appended to this.
+    mask_file_name : string (optional)
+        The name of the mask file.
+    value : int (optional)
+        An argument of the masking function.
+
+    Returns
+    -------
+    None
+    """
+    def mask_counting(data_array, value):
+        mask_calls.append(value)
+        return np.zeros_like(data_array, dtype=bool)
+    mask.base.create_directory_mask_file(
+        data_directory=directory, mask_function=mask_counting, 
+        mask_arguments={'value':value}, mask_file_name=mask_file_name,
+        subfolder=False, run=True, cache=True)
+    return None
+
+
+def test_mask_cache_hit(tmp_path):
+    """ This tests that an unchanged mask is not recreated."""
+
+    # Creating the mask twice from the same data and parameters.
+    __ = _create_cache_test_directory(directory=tmp_path)
+    mask_calls = []
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+
+    assert_message = ("The masking function calls are: {calls}"
+                      .format(calls=mask_calls))
+    assert mask_calls == [1], assert_message
+    # All done.
+    return None
+
+def test_mask_cache_miss_arguments(tmp_path):
+    """ This tests that a mask is recreated when its parameters 
+    change."""
+
+    # Creating the mask, then again with a different parameter.
+    __ = _create_cache_test_directory(directory=tmp_path)
+    mask_calls = []
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls, value=1)
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls, value=2)
+    # The recreated mask is then up to date.
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls, value=2)
+
+    assert_message = ("The masking function calls are: {calls}"
+                      .format(calls=mask_calls))
+    assert mask_calls == [1, 2], assert_message
+    # The mask file itself should have been replaced.
+    mask_header = ap_fits.getheader(os.path.join(tmp_path, 
+                                                 'cached.mask.fits'))
+    assert mask_header['VALUE'] == 2, "The mask file was not replaced."
+    # All done.
+    return None
+
+def test_mask_cache_miss_modification(tmp_path):
+    """ This tests that a mask is recreated when its data files are 
+    modified."""
+
+    # Creating the mask, then again after a data file is modified.
+    data_files = _create_cache_test_directory(directory=tmp_path)
+    mask_calls = []
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+    data_stat = os.stat(data_files[0])
+    os.utime(data_files[0], ns=(data_stat.st_atime_ns, 
+                                data_stat.st_mtime_ns + 10**9))
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+
+    assert_message = ("The masking function calls are: {calls}"
+                      .format(calls=mask_calls))
+    assert mask_calls == [1, 1], assert_message
+    # All done.
+    return None
+
+def test_mask_cache_corrupt(tmp_path):
+    """ This tests that a corrupt cache file is ignored and 
+    replaced."""
+
+    # Creating the mask beside a corrupt cache file.
+    __ = _create_cache_test_directory(directory=tmp_path)
+    cache_file = os.path.join(tmp_path, mask.base._MASK_CACHE_FILENAME)
+    with open(cache_file, 'w') as cache:
+        cache.write('{"not json')
+    mask_calls = []
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+    _create_cached_mask(directory=tmp_path, mask_calls=mask_calls)
+
+    assert_message = ("The masking function calls are: {calls}"
+                      .format(calls=mask_calls))
+    assert mask_calls == [1], assert_message
+    with open(cache_file, 'r') as cache:
+        assert isinstance(json.load(cache), dict), "The cache is not valid."
+    # All done.
+    return None
+
+def test_mask_cache_random_name(tmp_path):
+    """ This tests that masks with random names are not cached."""
+
+    # Creating a mask without a name.
+    __ = _create_cache_test_directory(directory=tmp_path)
+    mask_calls = []
+    with pytest.warns(core.error.InputWarning):
+        _create_cached_mask(directory=tmp_path, mask_calls=mask_calls, 
+                            mask_file_name='')
+
+    cache_file = os.path.join(tmp_path, mask.base._MASK_CACHE_FILENAME)
+    assert not os.path.isfile(cache_file), "The random mask was cached."
+    # All done.
+    return None
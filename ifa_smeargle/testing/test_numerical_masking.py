@@ -223,27 +223,33 @@ def test_mask_nothing():
 
     # Create the mask.
     test_mask = mask.mask_nothing(data_array=test_array)
-    # Create a masked array for both convince and testing.
-    test_masked_array = np_ma.array(test_array, mask=test_mask, dtype=int)
+    # The unmasked values, selected directly rather than through a 
+    # masked array.
+    test_unmasked_values = test_array[~test_mask]
 
     # A properly completed mask should have the same product value 
     # as this number. This is how the mask is checked.
     CHECK_STRING = '219.673198903714619732225307280947191575466862'
     CHECK_LOGARITHM = sy.Float(CHECK_STRING)
     __, __, product_log10 = core.math.ifas_large_integer_array_product(
-        integer_array=test_masked_array.compressed())
+        integer_array=test_unmasked_values)
 
     # Finally, check. As we are dealing with large single power
     # prime composite numbers and long decimals, and the smallest 
     # factor change of removing the 2 product still changes the
     # logarithm enough, checking if the logs are close is good 
     # enough.
-    assert_message = ("The check logarithm is: {check}  "
-                      "The product logarithm is: {log} "
-                      "The masked array is: \n {array}"
-                      .format(check=CHECK_LOGARITHM, log=product_log10,
-                              array=test_masked_array))
-    assert math.isclose(product_log10, CHECK_LOGARITHM), assert_message
+    # The masked array is only needed for the message, so it is 
+    # only made if the check fails.
+    if (not math.isclose(product_log10, CHECK_LOGARITHM)):
+        test_masked_array = np_ma.array(test_array, mask=test_mask, 
+                                        dtype=int)
+        assert_message = ("The check logarithm is: {check}  "
+                          "The product logarithm is: {log} "
+                          "The masked array is: \n {array}"
+                          .format(check=CHECK_LOGARITHM, log=product_log10,
+                                  array=test_masked_array))
+        pytest.fail(assert_message)
     # All done.
     return None
 
@@ -259,25 +265,31 @@ def test_mask_everything():
 
     # Create the mask.
     test_mask = mask.mask_everything(data_array=test_array)
-    # Create a masked array for both convince and testing.
-    test_masked_array = np_ma.array(test_array, mask=test_mask, dtype=int)
+    # The unmasked values, selected directly rather than through a 
+    # masked array.
+    test_unmasked_values = test_array[~test_mask]
 
     # A properly completed mask should have the same product value 
     # as this number. This is how the mask is checked.
     CHECK_LOGARITHM = -np.inf
     __, __, product_log10 = core.math.ifas_large_integer_array_product(
-        integer_array=test_masked_array.compressed())
+        integer_array=test_unmasked_values)
 
     # Finally, check. As we are dealing with large single power
     # prime composite numbers and long decimals, and the smallest 
     # factor change of removing the 2 product still changes the
     # logarithm enough, checking if the logs are close is good 
     # enough.
-    assert_message = ("The check logarithm is: {check}  "
-                      "The product logarithm is: {log} "
-                      "The masked array is: \n {array}"
-                      .format(check=CHECK_LOGARITHM, log=product_log10,
-                              array=test_masked_array))
-    assert math.isclose(product_log10, CHECK_LOGARITHM), assert_message
+    # The masked array is only needed for the message, so it is 
+    # only made if the check fails.
+    if (not math.isclose(product_log10, CHECK_LOGARITHM)):
+        test_masked_array = np_ma.array(test_array, mask=test_mask, 
+                                        dtype=int)
+        assert_message = ("The check logarithm is: {check}  "
+                          "The product logarithm is: {log} "
+                          "The masked array is: \n {array}"
+                          .format(check=CHECK_LOGARITHM, log=product_log10,
+                                  array=test_masked_array))
+        pytest.fail(assert_message)
     # All done.
     return None
\ No newline at end of file
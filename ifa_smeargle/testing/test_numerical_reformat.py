@@ -0,0 +1,108 @@
+"""
+This tests the reformatting functions to ensure that they are 
+appropriately collapsing data as expected.
+
+The collapsing tests operate on small cubes of known values, the 
+collapsed frames of which are simple to compute by hand.
+"""
+
+import os
+
+import astropy.io.fits as ap_fits
+import numpy as np
+import pytest
+
+import ifa_smeargle.core as core
+import ifa_smeargle.reformat as reformat
+import ifa_smeargle.testing as test
+
+
+def test_collapse_unsigned_integer_file(tmp_path):
+    """ This tests the collapsing of a fits file of unsigned 
+    integers, which Astropy stores scaled and so cannot memory map."""
+
+    # Creating the testing file. The frames of the cube are each 
+    # of a single value so that the collapsed frame is known.
+    frame_values = np.array([100, 200, 300, 400, 500, 600], dtype=np.uint16)
+    test_cube = (frame_values[:, None, None] 
+                 * np.ones((1, 4, 5), dtype=np.uint16))
+    test_file = os.path.join(tmp_path, 'unsigned.fits')
+    ap_fits.PrimaryHDU(test_cube).writeto(test_file)
+
+    # Collapse the file, the chunks are the first and last two 
+    # frames.
+    reformat.collapse._collapse_one_file(
+        file_name=test_file, 
+        collapse_function=reformat.collapse.collapse_by_average_endpoints,
+        subfolder=False, collapse_subdir=None, 
+        start_chunk=[[0, 1]], end_chunk=[[4, 5]], average_method='median',
+        frame_exposure_time=1, slice_suffixes=['_collapsed'])
+    collapsed_file = os.path.join(tmp_path, 'unsigned_collapsed.fits')
+    __, __, collapsed_data = core.io.read_fits_file(file_name=collapsed_file,
+                                                    silent=True)
+
+    # The difference between the averages of the chunks.
+    CHECK_VALUE = 550 - 150
+    assert_message = ("The check value is: {check}  "
+                      "The collapsed frame is: \n {array}"
+                      .format(check=CHECK_VALUE, array=collapsed_data))
+    assert np.all(collapsed_data == CHECK_VALUE), assert_message
+    # All done.
+    return None
+
+def test_collapse_nan_frames():
+    """ This tests that the frames with nan/null values are only 
+    nulled when requested, and that it is warned about."""
+
+    # Creating the testing array. A single pixel of the last frame 
+    # is null.
+    frame_values = np.array([1, 2, 3, 4, 5, 6], dtype=np.float32)
+    test_cube = frame_values[:, None, None] * np.ones((1, 3, 3))
+    test_cube[5, 0, 0] = np.nan
+
+    # The other pixels of the frame are used if not nulled.
+    collapsed_data = reformat.collapse.collapse_by_average_endpoints(
+        data_array=test_cube, start_chunk=[0, 1], end_chunk=[4, 5], 
+        average_method='mean')
+    assert_message = ("The collapsed frame is: \n {array}"
+                      .format(array=collapsed_data))
+    assert np.all(collapsed_data[1:, 1:] == 4), assert_message
+
+    # Nulling the frame leaves only the other frame of the chunk.
+    with pytest.warns(core.error.DataWarning):
+        nulled_data = reformat.collapse.collapse_by_average_endpoints(
+            data_array=test_cube, start_chunk=[0, 1], end_chunk=[4, 5], 
+            average_method='mean', null_nan_frames=True)
+    assert_message = ("The nulled collapsed frame is: \n {array}"
+                      .format(array=nulled_data))
+    assert np.all(nulled_data == 3.5), assert_message
+    # All done.
+    return None
+
+def test_collapse_inclusive_chunks():
+    """ This tests that both ends of the chunk ranges are included, 
+    and that chunks beyond the data are not allowed."""
+
+    # Creating the testing array. The frames are powers of two so 
+    # that the frames included in an average are known from it.
+    frame_values = 2.0 ** np.arange(8)
+    test_cube = frame_values[:, None, None] * np.ones((1, 3, 3))
+
+    # Two frame chunks, the averages are of exactly those frames.
+    collapsed_data = reformat.collapse.collapse_by_average_endpoints(
+        data_array=test_cube, start_chunk=[1, 2], end_chunk=[6, 7], 
+        average_method='mean', precision='float64')
+    CHECK_VALUE = (64 + 128) / 2 - (2 + 4) / 2
+    assert_message = ("The check value is: {check}  "
+                      "The collapsed frame is: \n {array}"
+                      .format(check=CHECK_VALUE, array=collapsed_data))
+    assert np.all(collapsed_data == CHECK_VALUE), assert_message
+
+    # The last frame of the data is the 7th, an end of 8 is 
+    # from an older exclusive configuration.
+    with pytest.raises(core.error.ConfigurationError):
+        reformat.collapse.collapse_by_average_endpoints(
+            data_array=test_cube, start_chunk=[1, 2], end_chunk=[6, 8], 
+            average_method='mean')
+    # All done.
+    return None
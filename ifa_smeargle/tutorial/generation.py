@@ -5,12 +5,17 @@ configurations, and other needed objects to begin or run through
 the tutorial.
 """
 
-import copy
-import shutil
+import functools
 import os
+import types
 import numpy as np
 import numpy.random as np_rand
 
+# The generator shared by all completely random data, it is created 
+# when first needed. Deterministic data is instead made with a 
+# freshly seeded generator, see the pseudorandom mode.
+_DEFAULT_RNG = None
+
 import ifa_smeargle.core as core
 
 def tutorial_generate_fits_file(generation_mode, data_shape, 
@@ -64,134 +69,66 @@ def tutorial_generate_fits_file(generation_mode, data_shape,
         raise core.error.InputError("The generation_mode cannot be turned "
                                     "into a string. The input must be a "
                                     "string.")
-    # Simple type checking for the shape of the data array.
-    data_shape = tuple(np.array(data_shape, dtype=int).tolist())
+    # The mode is case-insensitive.
+    mode = generation_mode.lower()
+    # Simple type checking for the shape of the data array. The 
+    # shape is small, Numpy is not needed to convert it.
+    try:
+        data_shape = tuple(int(axisdex) for axisdex in data_shape)
+    except (TypeError, ValueError):
+        raise core.error.InputError("The data_shape cannot be turned into "
+                                    "a tuple of integers. Input: {shape}"
+                                    .format(shape=data_shape))
     
+    # The pseudorandom numbers require a seed.
+    if ((mode == 'pseudorandom') and (seed is None)):
+        # But... they didn't give us the seed...
+        core.error.ifas_warning(core.error.InputWarning,
+                                "The `seed` for the random number "
+                                "generator is missing. The set seed "
+                                "of seed=42 will be used.")
+        # Using a default seed.
+        seed = 42
+
     # Decide on which method to generate a data array and run 
-    # with it.
-    if (generation_mode.lower() == 'fill'):
-        # All of the data should be a constant value.
-        if (fill_value is None):
-            # But... they didn't give us the value...
-            raise core.error.InputError("The `fill_value` for the data array "
-                                        "creation is missing.")
-        # Create the data array.
-        data_array = np.full(data_shape, fill_value)
-    elif (generation_mode.lower() == 'increment'):
-        # All of the data is incremented values.
-
-        # The total number of data values that need to be generated.
-        n_total = np.sum(np.array(tuple(data_shape), dtype=int))
-        # The data array through incremental generation. Creating
-        # the data array.
-        data_array = np.arange(n_total).reshape(tuple(data_shape))
-    elif (generation_mode.lower() == 'pseudorandom'):
-        # All of the data should be a random value based on the seed.
-        
-        # Checking if the seed exists.
-        if (seed is None):
-            # But... they didn't give us the seed...
-            core.error.ifas_warning(core.error.InputWarning,
-                                    "The `seed` for the random number "
-                                    "generator is missing. The set seed "
-                                    "of seed=42 will be used.")
-            # Using a default seed.
-            seed = 42
-        # Also check for the range, if it was provided, evaluate the
-        # minimum and maximum for number generation.
-        if (range is None):
-            # They didn't give us a range either.
-            core.error.ifas_warning(core.error.InputWarning,
-                                  ("The `range` for the random number "
-                                  "generator is missing. Using the defaults "
-                                  "0.0 and 1.0 instead as [0.0, 1.0)."))
-            min_range = 0.0
-            max_range = 1.0
-        else:
-            # Assigning the range based on their inputs.
-            min_range = np.nanmin(np.array(range, dtype=float))
-            max_range = np.nanmax(np.array(range, dtype=float))
-            # Test if their inputs for the maximum and minimum are
-            # the same, it would make little sense if they did. 
-            # Handle float-based equality.
-            float_tolerance = core.runtime.extract_runtime_configuration(
-                config_key='FLOAT_EQUALITY_TOLERANCE')
-            if (np.isclose(min_range, max_range, rtol=float_tolerance)):
-                core.error.ifas_error(core.error.InputErrro,
-                                      ("The minimum and maximum values "
-                                       "allowed for pseudorandom number "
-                                       "generation are very close. The "
-                                       "array might be populated with the "
-                                       "same value."))
-
-        # Psuedorandom data as generated from the seed. The shape is
-        # also factored in.
-        random_data = np_rand.default_rng(seed).random(data_shape)
-
-        # The numbers are currently [0,1). This scales them to be
-        # [min, max) as specified by the range of random values.
-        # See https://numpy.org/doc/stable/reference/random/generated/numpy.random.Generator.random.html#numpy.random.Generator.random 
-        # Creating the data array also.
-        data_array = min_range + (max_range - min_range) * random_data
-
-    elif (generation_mode.lower() == 'random'):
-        # The numbers provided should be completely random.
-
-        # Checking to see if the range was provided. If not, default
-        # to the normal [0.0, 1.0).
-        if (range is None):
-            # They didn't give us a range either.
-            core.error.ifas_warning(core.error.InputWarning,
-                                  ("The `range` for the random number "
-                                   "generator is missing. Using the defaults "
-                                   "0.0 and 1.0 instead as [0.0, 1.0)."))
-            min_range = 0.0
-            max_range = 1.0
-        else:
-            # Assigning the range based on their inputs.
-            min_range = np.nanmin(np.array(range, dtype=float))
-            max_range = np.nanmax(np.array(range, dtype=float))
-            # Test if their inputs for the maximum and minimum are
-            # the same, it would make little sense if they did. 
-            # Handle float-based equality.
-            float_tolerance = core.runtime.extract_runtime_configuration(
-                config_key='FLOAT_EQUALITY_TOLERANCE')
-            if (np.isclose(min_range, max_range, rtol=float_tolerance)):
-                core.error.ifas_error(core.error.InputError,
-                                      ("The minimum and maximum values "
-                                       "allowed for random number generation "
-                                       "are very close. The array might be "
-                                       "populated with the same value."))
-
-        # Random data as generated from the seed. The shape is
-        # also factored in. A None seed forces the usage of the 
-        # machine's random number seed generator, or its clock. 
-        # Both are good enough.
-        random_data = np_rand.default_rng(None).random(data_shape)
-
-        # The numbers are currently [0,1). This scales them to be
-        # [min, max) as specified by the range of random values.
-        # See https://cutt.ly/kyUUmgC .
-        # Creating the data array also.
-        data_array = min_range + (max_range - min_range) * random_data
-    else:
+    # with it. The random modes differ only by the seed; a None seed 
+    # forces the usage of the machine's random number seed 
+    # generator, or its clock. Both are good enough.
+    generation_functions = {
+        'fill':functools.partial(_generate_fill_array, 
+                                 data_shape=data_shape, 
+                                 fill_value=fill_value),
+        'increment':functools.partial(_generate_increment_array, 
+                                      data_shape=data_shape),
+        'pseudorandom':functools.partial(_scaled_random_array, 
+                                         data_shape=data_shape, 
+                                         seed=seed, random_range=range),
+        'random':functools.partial(_scaled_random_array, 
+                                   data_shape=data_shape, 
+                                   seed=None, random_range=range)}
+    try:
+        generation_function = generation_functions[mode]
+    except KeyError:
         # The generation mode is not a valid input.
         raise core.error.InputError("The generation mode input is not a "
                                     "valid mode of data generation. "
                                     "Current input: {input}"
                                     .format(input=generation_mode))
+    # Create the data array.
+    data_array = generation_function()
 
     # The data array should only be integers, mirroring 
-    # SAPHIRA arrays as they are integer only.
-    data_array = np.array(data_array, dtype=int)
+    # SAPHIRA arrays as they are integer only. Integer arrays, signed 
+    # or not, need not be copied.
+    if (data_array.dtype.kind not in 'iu'):
+        data_array = data_array.astype(np.int64, copy=False)
 
-    # Creating the header for this file.
-    data_header = {'TUTORIAL':True,
-                   'data_generator':generation_mode.lower(),
-                   'data_shape':str(data_shape),
-                   'fill_value':fill_value, 
-                   'seed':seed, 
-                   'range':str(range)}
+    # Creating the header for this file. The header template is 
+    # cached as the same files are often generated many times; the 
+    # fits writer needs a real dictionary.
+    data_header = dict(_build_tutorial_header(
+        mode=mode, data_shape=data_shape, fill_value=fill_value, 
+        seed=seed, range_string=str(range)))
 
     # Creating the Astropy object. There is no need to write it to
     # file.
@@ -202,3 +139,275 @@ def tutorial_generate_fits_file(generation_mode, data_shape,
     # All done, return.
     return hdu_object
 
+@functools.lru_cache(maxsize=32)
+def _build_tutorial_header(mode, data_shape, fill_value, seed, 
+                           range_string):
+    """ This builds the header template of the tutorial fits files. 
+    The results are cached so the template is read-only.
+
+    Parameters
+    ----------
+    mode : string
+        The lowercase generation mode of the data.
+    data_shape : tuple
+        The shape of the data.
+    fill_value : float
+        The value that fills the data array, if any.
+    seed : int
+        The seed of the pseudorandom number generator, if any.
+    range_string : string
+        The string representation of the range of the random number 
+        generator.
+
+    Returns
+    -------
+    header_template : MappingProxyType
+        The read-only header template.
+    """
+    header_template = types.MappingProxyType(
+        {'TUTORIAL':True,
+         'data_generator':mode,
+         'data_shape':str(data_shape),
+         'fill_value':fill_value, 
+         'seed':seed, 
+         'range':range_string})
+    return header_template
+
+def _generate_fill_array(data_shape, fill_value):
+    """ This generates a data array where all of the data is some
+    constant value.
+
+    Parameters
+    ----------
+    data_shape : tuple
+        The shape of the data that will be created.
+    fill_value : float
+        The value that fills the data array.
+
+    Returns
+    -------
+    data_array : ndarray
+        The filled data array, a read-only broadcast of the integer 
+        fill value.
+    """
+    if (fill_value is None):
+        # But... they didn't give us the value...
+        raise core.error.InputError("The `fill_value` for the data array "
+                                    "creation is missing.")
+    # Create the data array. A broadcast of the single value is 
+    # enough as the data is only read; writing it to a fits file 
+    # copies it into a real array.
+    fill_array = np.asarray(fill_value).astype(np.int64, copy=False)
+    data_array = np.broadcast_to(fill_array, data_shape)
+    return data_array
+
+def _generate_increment_array(data_shape):
+    """ This generates a data array where all of the data is 
+    incremented values, ordered by C indexing.
+
+    Parameters
+    ----------
+    data_shape : tuple
+        The shape of the data that will be created.
+
+    Returns
+    -------
+    data_array : ndarray
+        The incremented data array.
+    """
+    # The total number of data values that need to be generated.
+    n_total = int(np.prod(data_shape))
+    # The data array through incremental generation. Creating
+    # the data array, already as integers.
+    data_array = np.arange(n_total, dtype=np.int64).reshape(data_shape)
+    return data_array
+
+def _scaled_random_array(data_shape, seed, random_range):
+    """ This generates a data array of random values within a range, 
+    for both the pseudorandom and random generation modes.
+
+    Parameters
+    ----------
+    data_shape : tuple
+        The shape of the data that will be created.
+    seed : int
+        The seed value for the pseudorandom number generator. If 
+        None, the numbers are completely random.
+    random_range : array-like
+        The range for the random number generator. It takes only 
+        the highest and lowest numbers as the appropriate range. The 
+        range is [min, max). If None, it defaults to [0.0, 1.0).
+
+    Returns
+    -------
+    data_array : ndarray
+        The random data array.
+    """
+    # Check for the range, if it was provided, evaluate the
+    # minimum and maximum for number generation.
+    if (random_range is None):
+        # They didn't give us a range.
+        core.error.ifas_warning(core.error.InputWarning,
+                                ("The `range` for the random number "
+                                 "generator is missing. Using the defaults "
+                                 "0.0 and 1.0 instead as [0.0, 1.0)."))
+        min_range = 0.0
+        max_range = 1.0
+    else:
+        # Assigning the range based on their inputs.
+        min_range, max_range = _get_random_range_bounds(
+            random_range=random_range)
+        # Test if their inputs for the maximum and minimum are
+        # the same, it would make little sense if they did. 
+        # Handle float-based equality.
+        float_tolerance = core.runtime.extract_runtime_configuration(
+            config_key='FLOAT_EQUALITY_TOLERANCE')
+        if (np.isclose(min_range, max_range, rtol=float_tolerance)):
+            core.error.ifas_error(core.error.InputError,
+                                  ("The minimum and maximum values "
+                                   "allowed for random number generation "
+                                   "are very close. The array might be "
+                                   "populated with the same value."))
+
+    # Random data as generated from the seed. The shape is also 
+    # factored in.
+    random_data = np.empty(data_shape, dtype=np.float64)
+    if (seed is None):
+        generator = _get_default_rng()
+    else:
+        generator = _make_random_generator(seed=seed)
+    generator.random(out=random_data)
+
+    # The numbers are currently [0,1). This scales them to be
+    # [min, max) as specified by the range of random values.
+    # See https://cutt.ly/kyUUmgC .
+    if (core.jit.numba is not None):
+        # The compiled kernel scales and truncates the numbers into 
+        # integers in a single pass.
+        data_array = np.empty(data_shape, dtype=np.int64)
+        _scale_random_integers_kernel(
+            random_values=random_data.reshape(-1), 
+            min_range=float(min_range), 
+            scale=float(max_range - min_range), 
+            output=data_array.reshape(-1))
+    else:
+        # It is done in place to avoid temporary arrays.
+        data_array = random_data
+        data_array *= (max_range - min_range)
+        data_array += min_range
+    return data_array
+
+def _make_random_generator(seed):
+    """ This creates the random number generator, using the bit 
+    generator provided by the `BITGEN` runtime configuration.
+
+    Parameters
+    ----------
+    seed : int
+        The seed value for the bit generator. If None, fresh 
+        entropy from the machine is used instead.
+
+    Returns
+    -------
+    generator : Generator
+        The Numpy random number generator.
+    """
+    # The available bit generators.
+    bit_generators = {'SFC64':np_rand.SFC64, 'PCG64':np_rand.PCG64}
+    bit_generator_name = core.runtime.extract_runtime_configuration(
+        config_key='BITGEN')
+    try:
+        bit_generator = bit_generators[str(bit_generator_name).upper()]
+    except KeyError:
+        raise core.error.ConfigurationError("The `BITGEN` runtime "
+                                            "configuration is not a valid "
+                                            "bit generator. Input: {bitgen}"
+                                            .format(bitgen=bit_generator_name))
+    generator = np_rand.Generator(bit_generator(seed))
+    return generator
+
+def _get_default_rng():
+    """ This returns the random number generator shared by all 
+    completely random data, creating it if needed. Reusing it avoids 
+    reading fresh entropy from the machine for every call.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    generator : Generator
+        The shared Numpy random number generator.
+    """
+    global _DEFAULT_RNG
+    if (_DEFAULT_RNG is None):
+        _DEFAULT_RNG = _make_random_generator(seed=None)
+    return _DEFAULT_RNG
+
+def _reset_default_rng():
+    """ This discards the shared random number generator so that a 
+    new one is created when next needed. Forked processes must not 
+    repeat the random numbers of their parent.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+    """
+    global _DEFAULT_RNG
+    _DEFAULT_RNG = None
+    return None
+
+def _get_random_range_bounds(random_range):
+    """ This finds the minimum and maximum of the range for the 
+    random number generator, ignoring NaNs. The range is usually 
+    only a few numbers so plain Python is used rather than Numpy.
+
+    Parameters
+    ----------
+    random_range : array-like
+        The range for the random number generator.
+
+    Returns
+    -------
+    min_range : float
+        The lowest number of the range.
+    max_range : float
+        The highest number of the range.
+    """
+    try:
+        range_values = [float(valuedex) for valuedex in random_range]
+    except TypeError:
+        # A single number is not iterable.
+        range_values = [float(random_range)]
+    # NaNs are the only values not equal to themselves.
+    range_values = [valuedex for valuedex in range_values 
+                    if (valuedex == valuedex)]
+    if (len(range_values) == 0):
+        raise core.error.InputError("The `range` for the random number "
+                                    "generator does not have any valid "
+                                    "numbers. Input: {range}"
+                                    .format(range=random_range))
+    min_range = min(range_values)
+    max_range = max(range_values)
+    return min_range, max_range
+
+@core.jit.optional_jit(cache=True)
+def _scale_random_integers_kernel(random_values, min_range, scale, 
+                                  output):
+    """ This scales the flat [0, 1) random values to [min, max) and 
+    truncates them into the flat integer output array. The arithmetic 
+    matches the in-place Numpy scaling and integer conversion. """
+    for index in range(random_values.size):
+        output[index] = np.int64(random_values[index] * scale + min_range)
+    return None
+
+
+# Processes forked to generate data in parallel must each have their 
+# own shared random number generator.
+if (hasattr(os, 'register_at_fork')):
+    os.register_at_fork(after_in_child=_reset_default_rng)
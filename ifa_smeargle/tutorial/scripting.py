@@ -4,6 +4,7 @@ This is where all of the scripts that create different tutorials
 for each different type of detector lies.
 """
 
+import concurrent.futures
 import copy
 import os
 import time
@@ -28,31 +29,24 @@ def script_generate_saphira_tutorial(config):
     -------
     None    
     """
+    # Flatten the configuration for quicker access to its parameters.
+    flat_config = core.config.flatten_configuration(config_object=config)
+
     # Extract global parameters.
-    tutorial_directory = core.config.extract_configuration(
-        config_object=config, keys=['tutorial_directory'])
-    tutorial_creation_override = core.config.extract_configuration(
-        config_object=config, keys=['tutorial_creation_override'])
+    tutorial_directory = flat_config[('tutorial_directory',)]
+    tutorial_creation_override = flat_config[('tutorial_creation_override',)]
 
     # Extract parameters dedicated to the generation of the
     # tutorial.
-    number_of_fits_files = core.config.extract_configuration(
-        config_object=config, keys=['generation','number_of_fits_files'])
-    generation_mode = core.config.extract_configuration(
-        config_object=config, keys=['generation','generation_mode'])
-    fill_value = core.config.extract_configuration(
-        config_object=config, keys=['generation','fill_value'])
-    seed = core.config.extract_configuration(
-        config_object=config, keys=['generation','seed'])
-    minimum_range = core.config.extract_configuration(
-        config_object=config, keys=['generation','minimum_range'])
-    maximum_range = core.config.extract_configuration(
-        config_object=config, keys=['generation','maximum_range'])
-    data_shape = core.config.extract_configuration(
-        config_object=config, keys=['generation','data_shape'])
-
-    config_destination = core.config.extract_configuration(
-        config_object=config, keys=['generation','config_destination'])
+    number_of_fits_files = flat_config[('generation','number_of_fits_files')]
+    generation_mode = flat_config[('generation','generation_mode')]
+    fill_value = flat_config[('generation','fill_value')]
+    seed = flat_config[('generation','seed')]
+    minimum_range = flat_config[('generation','minimum_range')]
+    maximum_range = flat_config[('generation','maximum_range')]
+    data_shape = flat_config[('generation','data_shape')]
+
+    config_destination = flat_config[('generation','config_destination')]
 
     # Compiling the configurations into forms recognized by the 
     # functions that they are used for.
@@ -112,33 +106,37 @@ def script_generate_saphira_tutorial(config):
     fits_data_directory = core.strformat.combine_pathname(
         directory=[tutorial_directory,'tutorial_data'])
     os.makedirs(fits_data_directory, exist_ok=True)
-    # Creating the data files.
-    for index in range(number_of_fits_files):
-        # The seed itself doesn't need to be always the same number,
-        # but for pseudo-random, it needs to be predictable. 
-        # Incrementing it for every file ensures reproducible, but
-        # not the same, fits files for more than one fits generation.
-        used_seed = seed + index if isinstance(seed, (int,float)) else None
-
-        # Generating a data file based on the configuration.
-        hdu_object = tutorial.generation.tutorial_generate_fits_file(
-            generation_mode=generation_mode, data_shape=data_shape,
-            fill_value=fill_value, seed=used_seed, range=generation_range)
-        # The fits file should also have a name that more or less 
-        # simulates real data. SAPHIRA detectors use time-stamps for
-        # sequential data images. Dummy timestamps should work fine.
-        current_time = time.strftime("%Y%m%d_%H", time.localtime())
-        random_minuite_second = core.strformat.random_string(
-            characters='0123456', length=4)
-        fits_file_name = ''.join([current_time, random_minuite_second])
-        fits_path_name = core.strformat.combine_pathname(
-            directory=[fits_data_directory], 
-            file_name=[fits_file_name], extension=['.fits'])
-        # Save the fits file 
-        core.io.write_fits_file(
-            file_name=fits_path_name, 
-            hdu_header=None, hdu_data=None, hdu_object=hdu_object, 
-            overwrite=tutorial_creation_override, silent=False)
+    # The fits file should also have a name that more or less 
+    # simulates real data. SAPHIRA detectors use time-stamps for
+    # sequential data images. The hour is the same for all of the 
+    # files.
+    current_time = time.strftime("%Y%m%d_%H", time.localtime())
+    # Creating the data files. The files are independent of each 
+    # other, so they are generated in parallel processes if there 
+    # are enough of them.
+    parallel_workers = min(core.runtime.get_parallel_workers(), 
+                           number_of_fits_files)
+    generate_one_arguments = {'generation_mode':generation_mode,
+                              'data_shape':data_shape,
+                              'fill_value':fill_value,
+                              'seed':seed,
+                              'generation_range':generation_range,
+                              'fits_data_directory':fits_data_directory,
+                              'current_time':current_time,
+                              'overwrite':tutorial_creation_override}
+    if (parallel_workers <= 1):
+        for index in range(number_of_fits_files):
+            _generate_one_fits_file(index=index, **generate_one_arguments)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=parallel_workers) as executor:
+            generate_futures = [executor.submit(_generate_one_fits_file, 
+                                                index=index, 
+                                                **generate_one_arguments)
+                                for index in range(number_of_fits_files)]
+            for futuredex in generate_futures:
+                # Raise any exceptions from the generation.
+                __ = futuredex.result()
 
     # All possible configuration files that have been created should 
     # also be copied over.
@@ -176,3 +174,61 @@ def script_generate_saphira_tutorial(config):
 
     # It should be all done.
     return None
+
+
+def _generate_one_fits_file(index, generation_mode, data_shape, 
+                            fill_value, seed, generation_range, 
+                            fits_data_directory, current_time, 
+                            overwrite):
+    """ This generates and writes a single tutorial fits file for 
+    `script_generate_saphira_tutorial`. It is a module level 
+    function so that it may be sent to other processes.
+
+    Parameters
+    ----------
+    index : int
+        The index of the fits file being generated.
+    generation_mode : string
+        The generation mode that the data will adhere to.
+    data_shape : tuple
+        The shape of the data that will be created.
+    fill_value : float
+        The value that fills the data array, for the fill mode.
+    seed : int
+        The seed of the first file, for the pseudorandom mode.
+    generation_range : array-like
+        The range for the random number generator.
+    fits_data_directory : string
+        The directory that the fits file is written into.
+    current_time : string
+        The time-stamp which begins the fits file name.
+    overwrite : boolean
+        If True, a file of the same name will be overwritten.
+
+    Returns
+    -------
+    None
+    """
+    # The seed itself doesn't need to be always the same number,
+    # but for pseudo-random, it needs to be predictable. 
+    # Incrementing it for every file ensures reproducible, but
+    # not the same, fits files for more than one fits generation.
+    used_seed = seed + index if isinstance(seed, (int,float)) else None
+
+    # Generating a data file based on the configuration.
+    hdu_object = tutorial.generation.tutorial_generate_fits_file(
+        generation_mode=generation_mode, data_shape=data_shape,
+        fill_value=fill_value, seed=used_seed, range=generation_range)
+    # Dummy timestamps should work fine for the file name.
+    random_minuite_second = core.strformat.random_string(
+        characters='0123456', length=4)
+    fits_file_name = ''.join([current_time, random_minuite_second])
+    fits_path_name = core.strformat.combine_pathname(
+        directory=[fits_data_directory], 
+        file_name=[fits_file_name], extension=['.fits'])
+    # Save the fits file 
+    core.io.write_fits_file(
+        file_name=fits_path_name, 
+        hdu_header=None, hdu_data=None, hdu_object=hdu_object, 
+        overwrite=overwrite, silent=False)
+    return None